@@ -55,6 +55,23 @@ _MODE_PATTERNS: list[tuple[str, str]] = [
     (r"\bswitch\s+to\s+(?:normal|default)\b", "default"),
 ]
 
+# All trait/mode patterns as one alternation, one capture group each, so the
+# transcript is scanned once. The lookahead keeps matches zero-width, so
+# overlapping commands are all still found.
+_COMMAND_ACTIONS: list[tuple[str, str]] = (
+    [("up", trait) for _, trait in _TRAIT_UP_PATTERNS]
+    + [("down", trait) for _, trait in _TRAIT_DOWN_PATTERNS]
+    + [("mode", mode) for _, mode in _MODE_PATTERNS]
+)
+_COMMAND_PATTERN = re.compile(
+    "(?=(?:"
+    + "|".join(
+        f"({pattern})"
+        for pattern, _ in _TRAIT_UP_PATTERNS + _TRAIT_DOWN_PATTERNS + _MODE_PATTERNS
+    )
+    + "))"
+)
+
 _NAME_PATTERN = re.compile(
     r"(?:change\s+your\s+name\s+to|call\s+you|your\s+name\s+is)\s+(\w+)",
     re.IGNORECASE,
@@ -68,24 +85,18 @@ def parse_personality_command(transcript: str) -> PersonalityUpdate:
     text = transcript.lower().strip()
     update = PersonalityUpdate()
 
-    # Trait increases
-    for pattern, trait in _TRAIT_UP_PATTERNS:
-        if re.search(pattern, text):
-            update.trait_deltas[trait] = update.trait_deltas.get(trait, 0) + DELTA
-            update.is_command = True
-
-    # Trait decreases
-    for pattern, trait in _TRAIT_DOWN_PATTERNS:
-        if re.search(pattern, text):
-            update.trait_deltas[trait] = update.trait_deltas.get(trait, 0) - DELTA
-            update.is_command = True
-
-    # Mode switches
-    for pattern, mode in _MODE_PATTERNS:
-        if re.search(pattern, text):
-            update.set_mode = mode
-            update.is_command = True
-            break
+    # Each pattern counts once; sorted indices keep the declaration order
+    # (increases, then decreases, then the first listed mode wins)
+    matched = {m.lastindex - 1 for m in _COMMAND_PATTERN.finditer(text)}
+    for index in sorted(matched):
+        kind, value = _COMMAND_ACTIONS[index]
+        if kind == "up":
+            update.trait_deltas[value] = update.trait_deltas.get(value, 0) + DELTA
+        elif kind == "down":
+            update.trait_deltas[value] = update.trait_deltas.get(value, 0) - DELTA
+        elif update.set_mode is None:
+            update.set_mode = value
+        update.is_command = True
 
     # Name changes
     match = _NAME_PATTERN.search(transcript)  # preserve original case
@@ -6,13 +6,14 @@ bot profile traits, memories, user profile, and emotional context.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 from ai.prompts.system_buddy import SYSTEM_BUDDY
 from ai.prompts.safety_kid import SAFETY_KID
 from ai.prompts.modes import MODES
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PromptContext:
     bot_name: str = "Robot"
     warmth: float = 0.9
@@ -29,36 +30,68 @@ class PromptContext:
     emotion_confidence: float | None = None
 
 
-def build_system_prompt(ctx: PromptContext) -> str:
-    """Build the full system prompt from all layers."""
+@lru_cache(maxsize=256)
+def _build_static(
+    bot_name: str,
+    warmth: float,
+    humor: float,
+    curiosity: float,
+    energy: float,
+    verbosity: float,
+    max_sentences: int,
+    active_mode: str,
+    safety_enabled: bool,
+    user_profile_summary: str | None,
+) -> str:
+    """Layers that stay the same across a conversation's turns."""
     sections: list[str] = []
 
     # 1. Core personality
     personality = SYSTEM_BUDDY.format(
-        bot_name=ctx.bot_name,
-        warmth=ctx.warmth,
-        humor=ctx.humor,
-        curiosity=ctx.curiosity,
-        energy=ctx.energy,
-        verbosity=ctx.verbosity,
-        max_sentences=ctx.max_sentences,
+        bot_name=bot_name,
+        warmth=warmth,
+        humor=humor,
+        curiosity=curiosity,
+        energy=energy,
+        verbosity=verbosity,
+        max_sentences=max_sentences,
     )
     sections.append(personality)
 
     # 2. Safety layer
-    if ctx.safety_enabled:
+    if safety_enabled:
         sections.append(SAFETY_KID)
 
     # 3. Mode overlay
-    mode_text = MODES.get(ctx.active_mode, "")
+    mode_text = MODES.get(active_mode, "")
     if mode_text:
         sections.append(mode_text)
 
     # 4. User profile
-    if ctx.user_profile_summary:
+    if user_profile_summary:
         sections.append(
-            f"ABOUT THE PERSON YOU'RE TALKING TO:\n{ctx.user_profile_summary}"
+            f"ABOUT THE PERSON YOU'RE TALKING TO:\n{user_profile_summary}"
+        )
+
+    return "\n\n".join(sections)
+
+
+def build_system_prompt(ctx: PromptContext) -> str:
+    """Build the full system prompt from all layers."""
+    sections: list[str] = [
+        _build_static(
+            ctx.bot_name,
+            ctx.warmth,
+            ctx.humor,
+            ctx.curiosity,
+            ctx.energy,
+            ctx.verbosity,
+            ctx.max_sentences,
+            ctx.active_mode,
+            ctx.safety_enabled,
+            ctx.user_profile_summary,
         )
+    ]
 
     # 5. Relevant memories
     if ctx.memories:
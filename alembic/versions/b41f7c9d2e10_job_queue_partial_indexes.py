@@ -0,0 +1,35 @@
+"""job queue partial indexes
+
+Revision ID: b41f7c9d2e10
+Revises: a36252f2dcbb
+Create Date: 2026-10-15 09:12:03.418207
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b41f7c9d2e10'
+down_revision = 'a36252f2dcbb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # dequeue hot path only ever looks at pending rows ready to run
+    op.create_index(
+        'ix_jobs_pending_runafter', 'jobs', ['run_after'],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    # periodic stale-lock recovery scans processing rows by lock age
+    op.create_index(
+        'ix_jobs_stuck', 'jobs', ['locked_at'],
+        postgresql_where=sa.text("status = 'processing'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_stuck', table_name='jobs')
+    op.drop_index('ix_jobs_pending_runafter', table_name='jobs')
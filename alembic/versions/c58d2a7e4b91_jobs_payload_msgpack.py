@@ -0,0 +1,59 @@
+"""jobs.payload as msgpack bytea
+
+Revision ID: c58d2a7e4b91
+Revises: b41f7c9d2e10
+Create Date: 2026-10-15 10:41:27.903115
+
+"""
+from __future__ import annotations
+
+import json
+
+import msgpack
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'c58d2a7e4b91'
+down_revision = 'b41f7c9d2e10'
+branch_labels = None
+depends_on = None
+
+# msgpack encoding of {}
+EMPTY_MAP = "'\\x80'::bytea"
+
+
+def upgrade() -> None:
+    # 1) add new column as nullable
+    op.add_column('jobs', sa.Column('payload_mp', sa.LargeBinary(), nullable=True))
+
+    # 2) backfill: msgpack can't be produced in SQL, so re-encode in Python
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, payload FROM jobs")).fetchall()
+    if rows:
+        conn.execute(
+            sa.text("UPDATE jobs SET payload_mp = :mp WHERE id = :id"),
+            [{"id": r.id, "mp": msgpack.packb(r.payload or {}, use_bin_type=True)} for r in rows],
+        )
+
+    # 3) swap columns and enforce NOT NULL
+    op.drop_column('jobs', 'payload')
+    op.alter_column('jobs', 'payload_mp', new_column_name='payload',
+                    nullable=False, server_default=sa.text(EMPTY_MAP))
+
+
+def downgrade() -> None:
+    op.add_column('jobs', sa.Column('payload_json', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, payload FROM jobs")).fetchall()
+    if rows:
+        conn.execute(
+            sa.text("UPDATE jobs SET payload_json = CAST(:js AS jsonb) WHERE id = :id"),
+            [{"id": r.id, "js": json.dumps(msgpack.unpackb(r.payload, raw=False))} for r in rows],
+        )
+
+    op.drop_column('jobs', 'payload')
+    op.alter_column('jobs', 'payload_json', new_column_name='payload',
+                    nullable=False, server_default=sa.text("'{}'::jsonb"))
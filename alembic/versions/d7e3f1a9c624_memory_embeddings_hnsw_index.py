@@ -0,0 +1,28 @@
+"""memory_embeddings hnsw index
+
+Revision ID: d7e3f1a9c624
+Revises: c58d2a7e4b91
+Create Date: 2026-10-15 11:20:48.550612
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd7e3f1a9c624'
+down_revision = 'c58d2a7e4b91'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Without this, ORDER BY embedding <=> :query is a sequential scan per user
+    op.execute(
+        "CREATE INDEX ix_mem_emb_hnsw ON memory_embeddings "
+        "USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_mem_emb_hnsw', table_name='memory_embeddings')
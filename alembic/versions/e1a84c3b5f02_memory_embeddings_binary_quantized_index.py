@@ -0,0 +1,36 @@
+"""memory_embeddings binary quantized hnsw index
+
+Revision ID: e1a84c3b5f02
+Revises: d7e3f1a9c624
+Create Date: 2026-10-15 12:03:16.274930
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e1a84c3b5f02'
+down_revision = 'd7e3f1a9c624'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Requires pgvector >= 0.7 (binary_quantize, bit_hamming_ops); retrieval
+    # uses hnsw.iterative_scan only where the installed version has it (>= 0.8)
+    op.execute(
+        "CREATE INDEX ix_mem_emb_bq_hnsw ON memory_embeddings "
+        "USING hnsw ((binary_quantize(embedding)::bit(1536)) bit_hamming_ops) "
+        "WITH (m = 16, ef_construction = 64)"
+    )
+    # retrieval no longer orders by full-precision cosine over the whole table
+    op.drop_index('ix_mem_emb_hnsw', table_name='memory_embeddings')
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX ix_mem_emb_hnsw ON memory_embeddings "
+        "USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)"
+    )
+    op.drop_index('ix_mem_emb_bq_hnsw', table_name='memory_embeddings')
@@ -42,6 +42,9 @@ class Settings(BaseSettings):
     openai_stt_model: str = "whisper-1"
     openai_embedding_model: str = "text-embedding-3-small"
 
+    # Directory with model.onnx + tokenizer.json (scripts/export_emotion_model.py)
+    emotion_model_path: str | None = None
+
     # ─────────────────────────────────────────────
     # API
     # ─────────────────────────────────────────────
@@ -64,7 +67,11 @@ class Settings(BaseSettings):
     # Worker
     # ─────────────────────────────────────────────
     worker_poll_interval: float = 1.0
+    # Safety-net poll while waiting on LISTEN/NOTIFY (delayed retries, missed notifies)
+    worker_fallback_poll_interval: float = 15.0
     worker_max_retries: int = 3
+    # Jobs a single worker process runs at once (each in its own DB session)
+    worker_concurrency: int = 4
 
     # ─────────────────────────────────────────────
     # Derived Properties
@@ -2,22 +2,33 @@
 from __future__ import annotations
 
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.app.config import get_settings
 from api.app.routes import audio, bot_profile, health, voice
+from services.observability import drain_events
 
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Background event writes would otherwise be dropped with the loop
+    await drain_events()
+
+
 app = FastAPI(
     title="Companion API",
     description="Conversational AI companion orchestrator",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -1,19 +1,58 @@
 # api/app/routes/audio.py
 from __future__ import annotations
 
+import asyncio
 import uuid
 from pathlib import Path
+from typing import AsyncIterator
 
+import aiofiles
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.app.dependencies import get_current_user, get_session
 from models.interaction import Interaction
 from models.user import User
+from services.openai_tts import STREAM_CHUNK_BYTES, partial_path
 
 router = APIRouter(tags=["audio"])
 
+TAIL_POLL_SECONDS = 0.05
+# Give up on a .part file that stops growing without being finished
+TAIL_IDLE_TIMEOUT_SECONDS = 30.0
+
+
+async def _tail_partial(final_path: Path, part_path: Path, part_file) -> AsyncIterator[bytes]:
+    """
+    Yield the in-progress `.part` file as it grows, until synthesis ends.
+
+    TTS renames the `.part` file to the final path when done (or unlinks it on
+    failure); the open handle keeps reading the same file either way.
+    """
+    idle = 0.0
+    try:
+        while True:
+            chunk = await part_file.read(STREAM_CHUNK_BYTES)
+            if chunk:
+                idle = 0.0
+                yield chunk
+                continue
+
+            if final_path.exists() or not part_path.exists():
+                # Writer is done; drain whatever landed after the last read
+                rest = await part_file.read()
+                if rest:
+                    yield rest
+                return
+
+            if idle >= TAIL_IDLE_TIMEOUT_SECONDS:
+                return
+            await asyncio.sleep(TAIL_POLL_SECONDS)
+            idle += TAIL_POLL_SECONDS
+    finally:
+        await part_file.close()
+
 
 @router.get("/audio/{interaction_id}.wav")
 async def get_audio(
@@ -21,16 +60,31 @@ async def get_audio(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_session),
 ):
-    """Retrieve TTS audio for a completed interaction."""
+    """Retrieve TTS audio for an interaction that is streaming or complete."""
     interaction = await db.get(Interaction, interaction_id)
 
     if interaction is None or interaction.user_id != user.id:
         raise HTTPException(status_code=404, detail="Interaction not found")
 
-    if interaction.status != "complete" or not interaction.audio_output_path:
+    if interaction.status not in ("streaming", "complete") or not interaction.audio_output_path:
         raise HTTPException(status_code=404, detail="Audio not yet available")
 
     audio_path = Path(interaction.audio_output_path)
+    if interaction.status == "streaming" and not audio_path.exists():
+        # Still being synthesized: stream what has landed so far and follow
+        # the file until TTS finishes (length unknown, so no Content-Length)
+        part_path = partial_path(audio_path)
+        try:
+            part_file = await aiofiles.open(part_path, "rb")
+        except FileNotFoundError:
+            pass  # finished (or failed) since we looked
+        else:
+            return StreamingResponse(
+                _tail_partial(audio_path, part_path, part_file),
+                media_type="audio/wav",
+                headers={"Content-Disposition": f'attachment; filename="{interaction_id}.wav"'},
+            )
+
     if not audio_path.exists():
         raise HTTPException(status_code=404, detail="Audio file missing")
 
@@ -10,11 +10,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from api.app.config import get_settings
 from api.app.dependencies import get_current_user, get_session
 from api.app.schemas.voice import InteractionDetail, VoiceInteractionResponse
+from jobs.payloads import ProcessVoicePayload
 from jobs.queue import enqueue
 from models.conversation import Conversation
 from models.interaction import Interaction
 from models.user import User
-from services.observability import log_event
+from services.observability import emit_event
 from api.app.schemas.dev_voice import DevVoiceRequest  # add import
 
 router = APIRouter(tags=["voice"])
@@ -67,18 +68,18 @@ async def create_dev_voice_interaction(
     )
     db.add(interaction)
     await db.flush()
-    trace_id = uuid.uuid4().hex
 
     # Enqueue job (same as real voice path)
-    await enqueue(db, "PROCESS_VOICE_INTERACTION", {
-        "interaction_id": str(interaction.id),
-        "user_id": str(user.id),
-        "conversation_id": str(conversation.id),
-        "dev_mode": True,  # optional flag (worker can ignore)
-        "trace_id":trace_id
-    })
+    payload = ProcessVoicePayload(
+        interaction_id=interaction.id,
+        user_id=user.id,
+        conversation_id=conversation.id,
+        dev_mode=True,  # optional flag (worker can ignore)
+    )
+    await enqueue(db, "PROCESS_VOICE_INTERACTION", payload.model_dump(mode="json"))
+    await db.commit()
 
-    await log_event(db, "dev_voice_interaction_created", "info", source="api", metadata={
+    emit_event("dev_voice_interaction_created", "info", source="api", metadata={
         "interaction_id": str(interaction.id),
         "conversation_id": str(conversation.id),
     })
@@ -138,18 +139,15 @@ async def create_voice_interaction(
     await db.flush()
 
     # Enqueue job
-    await enqueue(
-        db,
-        "PROCESS_VOICE_INTERACTION",
-        {
-            "interaction_id": str(interaction.id),
-            "user_id": str(user.id),
-            "conversation_id": str(conversation.id),
-        },
+    payload = ProcessVoicePayload(
+        interaction_id=interaction.id,
+        user_id=user.id,
+        conversation_id=conversation.id,
     )
+    await enqueue(db, "PROCESS_VOICE_INTERACTION", payload.model_dump(mode="json"))
+    await db.commit()
 
-    await log_event(
-        db,
+    emit_event(
         "voice_interaction_created",
         "info",
         source="api",
@@ -1,20 +1,44 @@
 # db/engine.py
 from __future__ import annotations
 
+from typing import Any
+
+import orjson
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from api.app.config import get_settings
 
+STATEMENT_CACHE_SIZE = 1024
+
 _engine: AsyncEngine | None = None
 
 
+def _json_dumps(value: Any) -> str:
+    """orjson-backed serializer for JSON/JSONB columns."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 def get_engine() -> AsyncEngine:
     global _engine
     if _engine is None:
+        url = make_url(get_settings().database_url)
+        connect_args: dict[str, Any] = {}
+        if url.get_driver_name() == "asyncpg":
+            # Short OLTP queries never benefit from JIT; skip its startup cost
+            connect_args["server_settings"] = {"jit": "off"}
+            # Keep hot statements prepared per connection (defaults are 100);
+            # the first is SQLAlchemy's adapter cache, the second asyncpg's own
+            connect_args["prepared_statement_cache_size"] = STATEMENT_CACHE_SIZE
+            connect_args["statement_cache_size"] = STATEMENT_CACHE_SIZE
+
         _engine = create_async_engine(
-            get_settings().database_url,
+            url,
             pool_size=10,
             max_overflow=20,
             echo=False,
+            json_serializer=_json_dumps,
+            json_deserializer=orjson.loads,
+            connect_args=connect_args,
         )
     return _engine
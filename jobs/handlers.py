@@ -9,18 +9,22 @@ Hardened for:
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 import uuid
 import random
 import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable
 
-from sqlalchemy import select
+from sqlalchemy import Text, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from api.app.config import get_settings
+from jobs.payloads import ProcessVoicePayload
 from models.bot_profile import BotProfile
 from models.conversation import Conversation
 from models.interaction import Interaction
@@ -30,7 +34,7 @@ from services.emotion_detector import detect_emotion
 from services.memory_service import retrieve_relevant_memories
 from services.openai_llm import chat_completion
 from services.openai_stt import transcribe_audio
-from services.openai_tts import synthesize_speech
+from services.openai_tts import partial_path, synthesize_speech
 
 from ai.intents.story import (
     STORY_INTENT,
@@ -107,15 +111,67 @@ def looks_like_story_topic(text: str) -> bool:
         return False
     return len(t.split()) <= 8
 
+async def patch_pending_slots(db: AsyncSession, conversation: Conversation, **values: Any) -> None:
+    """
+    Set scalar keys inside conversation.pending_slots via jsonb_set, so
+    small story-flow steps don't rewrite the whole JSONB blob.
+    """
+    expr = func.coalesce(Conversation.pending_slots, literal({}, JSONB))
+    for key, value in values.items():
+        expr = func.jsonb_set(expr, cast([key], ARRAY(Text)), literal(value, JSONB))
+
+    await db.execute(
+        update(Conversation)
+        .where(Conversation.id == conversation.id)
+        .values(pending_slots=expr)
+        .execution_options(synchronize_session=False)
+    )
+    # keep the loaded object in sync without marking it dirty
+    set_committed_value(
+        conversation,
+        "pending_slots",
+        {**(conversation.pending_slots or {}), **values},
+    )
+
+
+async def stream_reply_audio(
+    text: str,
+    audio_out: Path,
+    voice: str,
+    on_streaming: Callable[[], Awaitable[None]],
+) -> None:
+    """
+    Synthesize text to audio_out. Once the first audio bytes are on disk and
+    synthesis is still running, on_streaming is awaited so the client can start
+    playback. On failure the TTS task is cancelled and the `.part` file removed.
+    """
+    ready = asyncio.Event()
+    tts_task = asyncio.create_task(synthesize_speech(text, audio_out, voice=voice, ready=ready))
+    ready_wait = asyncio.create_task(ready.wait())
+    try:
+        await asyncio.wait({ready_wait, tts_task}, return_when=asyncio.FIRST_COMPLETED)
+        if not tts_task.done():
+            await on_streaming()
+        await tts_task
+    finally:
+        pending = [task for task in (ready_wait, tts_task) if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if not audio_out.exists():
+            partial_path(audio_out).unlink(missing_ok=True)
+
 
 async def handle_process_voice_interaction(db: AsyncSession, payload: dict) -> dict:
     settings = get_settings()
 
-    interaction_id = uuid.UUID(payload["interaction_id"])
-    user_id = uuid.UUID(payload["user_id"])
+    params = ProcessVoicePayload.model_validate(payload)
+    interaction_id = params.interaction_id
+    user_id = params.user_id
 
-    # Trace id per job/interaction
-    trace_id = payload.get("trace_id") or uuid.uuid4().hex
+    # Trace id per job/interaction (generated at enqueue for older payloads too)
+    trace_id = params.trace_id
 
     t0 = time.monotonic()
 
@@ -176,6 +232,7 @@ async def handle_process_voice_interaction(db: AsyncSession, payload: dict) -> d
 
     # ── Routing setup ───────────────────────────
     goto_llm = True
+    telling_story = False
     assistant_reply: str | None = None
 
     bot_profile = (
@@ -240,12 +297,12 @@ async def handle_process_voice_interaction(db: AsyncSession, payload: dict) -> d
                 )
                 system_prompt = "You are a warm bedtime storyteller for children."
                 goto_llm = True
+                telling_story = True
 
             elif is_plain_no(text):
-                merged = dict(slots)
-                merged["no_count"] = int(merged.get("no_count", 0)) + 1
+                no_count = int(slots.get("no_count", 0)) + 1
 
-                if merged["no_count"] >= 2:
+                if no_count >= 2:
                     # Second plain "no" -> exit story mode
                     conversation.pending_intent = None
                     conversation.pending_slots = None
@@ -255,8 +312,12 @@ async def handle_process_voice_interaction(db: AsyncSession, payload: dict) -> d
                     goto_llm = False
                 else:
                     # First plain "no" -> revise theme (ask for a new topic)
-                    merged["awaiting_confirmation"] = False
-                    conversation.pending_slots = merged
+                    await patch_pending_slots(
+                        db,
+                        conversation,
+                        no_count=no_count,
+                        awaiting_confirmation=False,
+                    )
                     await checkpoint()
 
                     assistant_reply = "Okay 😊 What should the bedtime story be about instead?"
@@ -327,7 +388,8 @@ async def handle_process_voice_interaction(db: AsyncSession, payload: dict) -> d
     if goto_llm:
         try:
             await checkpoint()
-            assistant_reply = await chat_completion(system_prompt, transcript)
+            # Greetings/thanks may reuse a recent reply; story turns never do
+            assistant_reply = await chat_completion(system_prompt, transcript, use_cache=not telling_story)
         except Exception as exc:
             logger.error("trace=%s llm failed: %s", trace_id, exc)
             assistant_reply = "Hmm, I’m thinking really hard 😊 Can you tell me again?"
@@ -351,13 +413,19 @@ async def handle_process_voice_interaction(db: AsyncSession, payload: dict) -> d
     if not audio_out.exists():
         voice = bot_profile.voice if bot_profile and bot_profile.voice else settings.openai_tts_voice
 
-        try:
+        async def publish_streaming() -> None:
+            interaction.audio_output_path = str(audio_out)
+            interaction.status = "streaming"
             await checkpoint()
-            await synthesize_speech(assistant_reply, audio_out, voice=voice)
+
+        await checkpoint()
+        try:
+            await stream_reply_audio(assistant_reply, audio_out, voice, on_streaming=publish_streaming)
         except Exception as exc:
             logger.error("trace=%s tts failed: %s", trace_id, exc)
 
-    interaction.audio_output_path = str(audio_out)
+    # No audio (TTS failed): the turn still completes with its text reply
+    interaction.audio_output_path = str(audio_out) if audio_out.exists() else None
 
     # ── finalize ────────────────────────────────
     interaction.latency_ms = int((time.monotonic() - t0) * 1000)
@@ -0,0 +1,21 @@
+# jobs/payloads.py
+"""
+Typed job payloads, validated once when the job is enqueued and
+parsed once when it is handled.
+"""
+from __future__ import annotations
+
+import uuid
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ProcessVoicePayload(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    interaction_id: uuid.UUID
+    user_id: uuid.UUID
+    conversation_id: uuid.UUID | None = None
+    trace_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    dev_mode: bool = False
+
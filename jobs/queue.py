@@ -5,14 +5,20 @@ import logging
 import uuid
 from datetime import datetime, timezone, timedelta
 
-from sqlalchemy import select, update, or_, and_
+from sqlalchemy import case, func, insert, literal, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from models.event import Event
 from models.job import Job
 
 logger = logging.getLogger(__name__)
 
 LOCK_TIMEOUT_SECONDS = 60
+STALE_RECOVERY_INTERVAL_SECONDS = 5
+
+# Postgres channel workers LISTEN on; enqueue NOTIFYs it so idle workers wake immediately.
+NOTIFY_CHANNEL = "voice_jobs"
 
 
 def utcnow() -> datetime:
@@ -32,6 +38,12 @@ async def enqueue(
     )
     db.add(job)
     await db.flush()
+
+    # Delivered on commit, so workers never wake before the row is visible.
+    await db.execute(
+        text("SELECT pg_notify(:channel, :job_id)"),
+        {"channel": NOTIFY_CHANNEL, "job_id": str(job.id)},
+    )
     logger.info("Enqueued job %s [%s]", job.id, job.job_type)
     return job
 
@@ -41,60 +53,114 @@ async def dequeue(
     worker_id: str,
     job_types: list[str] | None = None,
 ) -> Job | None:
+    """Claims the next runnable job, or returns None if nothing is ready."""
+    jobs = await dequeue_batch(db, worker_id, limit=1, job_types=job_types)
+    return jobs[0] if jobs else None
+
+
+async def dequeue_batch(
+    db: AsyncSession,
+    worker_id: str,
+    limit: int,
+    job_types: list[str] | None = None,
+) -> list[Job]:
     """
-    Claims next runnable job.
-    Also recovers stale processing jobs.
+    Claims up to `limit` runnable jobs with a single UPDATE ... RETURNING.
+    Stale processing jobs are put back by recover_stale_locks, not here,
+    so this stays a scan of the ix_jobs_pending_runafter partial index.
     """
 
     now = utcnow()
-    stale_cutoff = now - timedelta(seconds=LOCK_TIMEOUT_SECONDS)
 
-    stmt = (
-        select(Job)
+    candidates = (
+        select(Job.id)
         .where(
-            or_(
-                # Normal pending jobs ready to run
-                and_(
-                    Job.status == "pending",
-                    Job.run_after <= now,
-                ),
-                # Stale locked jobs
-                and_(
-                    Job.status == "processing",
-                    Job.locked_at <= stale_cutoff,
-                ),
-            )
+            Job.status == "pending",
+            Job.run_after <= now,
         )
-        .order_by(Job.created_at.asc())
-        .limit(1)
+        .order_by(Job.run_after.asc())
+        .limit(limit)
         .with_for_update(skip_locked=True)
     )
 
     if job_types:
-        stmt = stmt.where(Job.job_type.in_(job_types))
+        candidates = candidates.where(Job.job_type.in_(job_types))
+
+    # Claim in a single round-trip: UPDATE ... WHERE id IN (SELECT ... SKIP LOCKED) RETURNING *
+    stmt = (
+        update(Job)
+        .where(Job.id.in_(candidates))
+        .values(
+            status="processing",
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=Job.attempts + 1,
+        )
+        .returning(Job)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
 
     result = await db.execute(stmt)
-    job = result.scalar_one_or_none()
+    # RETURNING order is unspecified; hand jobs out oldest first
+    jobs = sorted(result.scalars().all(), key=lambda job: job.run_after)
 
-    if job is None:
-        return None
+    for job in jobs:
+        logger.info(
+            "Worker %s claimed job %s [%s] trace=%s",
+            worker_id,
+            job.id,
+            job.job_type,
+            job.trace_id,
+        )
 
-    job.status = "processing"
-    job.locked_by = worker_id
-    job.locked_at = now
-    job.attempts += 1
+    return jobs
 
-    await db.flush()
 
-    logger.info(
-        "Worker %s claimed job %s [%s] trace=%s",
-        worker_id,
-        job.id,
-        job.job_type,
-        job.trace_id,
+async def next_pending_run_after(db: AsyncSession) -> datetime | None:
+    """
+    Earliest run_after among pending jobs (an ix_jobs_pending_runafter lookup).
+    Retries scheduled in the future get no NOTIFY, so idle workers time
+    their wait with this.
+    """
+    result = await db.execute(select(func.min(Job.run_after)).where(Job.status == "pending"))
+    return result.scalar_one_or_none()
+
+
+async def recover_stale_locks(db: AsyncSession) -> int:
+    """
+    Returns jobs whose worker lock expired to the pending queue, or marks
+    them failed once they are out of attempts. The crashed run already
+    counts: dequeue increments attempts when it claims a job.
+    Runs on a timer (see worker) rather than inside every dequeue.
+    """
+    now = utcnow()
+    stale_cutoff = now - timedelta(seconds=LOCK_TIMEOUT_SECONDS)
+    retry = Job.attempts < Job.max_attempts
+
+    stmt = (
+        update(Job)
+        .where(
+            Job.status == "processing",
+            Job.locked_at < stale_cutoff,
+        )
+        .values(
+            status=case((retry, "pending"), else_="failed"),
+            run_after=case((retry, now), else_=Job.run_after),
+            error=f"Worker lock expired after {LOCK_TIMEOUT_SECONDS}s",
+            locked_by=None,
+            locked_at=None,
+        )
+        .returning(Job.status)
+        .execution_options(synchronize_session=False)
     )
+    statuses = (await db.execute(stmt)).scalars().all()
 
-    return job
+    requeued = sum(1 for status in statuses if status == "pending")
+    if requeued:
+        logger.warning("Recovered %d stale job lock(s)", requeued)
+    if len(statuses) > requeued:
+        logger.error("Failed %d job(s) whose worker kept dying", len(statuses) - requeued)
+    return requeued
 
 
 async def complete_job(
@@ -119,43 +185,73 @@ async def complete_job(
 
 async def fail_job(
     db: AsyncSession,
-    job: Job,
+    job_id: uuid.UUID,
     error: str,
+    event_metadata: dict | None = None,
 ) -> None:
     """
     Schedules retry with backoff or marks permanently failed.
+    Single conditional UPDATE — the row is never loaded.
     No sleeping here.
+
+    With event_metadata, a `job_failed` event is inserted by the same
+    statement (data-modifying CTE), so no separate INSERT round-trip.
     """
 
     now = utcnow()
+    retry = Job.attempts < Job.max_attempts
 
-    if job.attempts < job.max_attempts:
-        backoff_seconds = 2 ** job.attempts
-        job.status = "pending"
-        job.run_after = now + timedelta(seconds=backoff_seconds)
-        job.locked_by = None
-        job.locked_at = None
-        job.error = error
+    stmt = (
+        update(Job)
+        .where(Job.id == job_id)
+        .values(
+            status=case((retry, "pending"), else_="failed"),
+            run_after=case(
+                (retry, literal(now) + func.power(2, Job.attempts) * timedelta(seconds=1)),
+                else_=Job.run_after,
+            ),
+            error=error,
+            locked_by=None,
+            locked_at=None,
+        )
+        .returning(Job.status, Job.attempts, Job.max_attempts, Job.trace_id)
+        .execution_options(synchronize_session=False)
+    )
+
+    if event_metadata is not None:
+        failed = stmt.cte("failed")
+        events = Event.__table__
+        event = insert(events).from_select(
+            [events.c.id, events.c.event_type, events.c.level, events.c.source, events.c.metadata],
+            select(
+                literal(uuid.uuid4()),
+                literal("job_failed"),
+                literal("error"),
+                literal("worker"),
+                literal(event_metadata, JSONB),
+            ).select_from(failed),
+        )
+        stmt = select(failed).add_cte(event.cte("failed_event"))
+
+    row = (await db.execute(stmt)).one_or_none()
 
+    if row is None:
+        logger.error("Job %s not found while recording failure", job_id)
+        return
+
+    if row.status == "pending":
         logger.warning(
             "Job %s retry %d/%d in %ds trace=%s",
-            job.id,
-            job.attempts,
-            job.max_attempts,
-            backoff_seconds,
-            job.trace_id,
+            job_id,
+            row.attempts,
+            row.max_attempts,
+            2 ** row.attempts,
+            row.trace_id,
         )
     else:
-        job.status = "failed"
-        job.error = error
-        job.locked_by = None
-        job.locked_at = None
-
         logger.error(
             "Job %s permanently failed after %d attempts trace=%s",
-            job.id,
-            job.attempts,
-            job.trace_id,
+            job_id,
+            row.attempts,
+            row.trace_id,
         )
-
-    await db.flush()
\ No newline at end of file
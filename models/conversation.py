@@ -19,4 +19,5 @@ class Conversation(Base, UUIDPrimaryKey, TimestampMixin):
     pending_slots: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
     user = relationship("User", back_populates="conversations")
-    interactions = relationship("Interaction", back_populates="conversation", lazy="selectin")
+    # Never implicitly loaded; callers that need it use selectinload(Conversation.interactions)
+    interactions = relationship("Interaction", back_populates="conversation", lazy="raise")
@@ -36,6 +36,6 @@ class Interaction(Base, UUIDPrimaryKey, TimestampMixin):
     latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     # Status
-    status: Mapped[str] = mapped_column(String(32), default="pending")  # pending | processing | complete | failed
+    status: Mapped[str] = mapped_column(String(32), default="pending")  # pending | processing | streaming | complete | failed
 
     conversation = relationship("Conversation", back_populates="interactions")
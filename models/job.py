@@ -2,23 +2,30 @@
 from __future__ import annotations
 
 import uuid
-from sqlalchemy import DateTime
-from sqlalchemy import Integer, String, Text
+from sqlalchemy import DateTime, Index
+from sqlalchemy import Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime, timezone
 from models.base import Base, TimestampMixin, UUIDPrimaryKey
+from models.types import MsgpackType
 
 
 class Job(Base, UUIDPrimaryKey, TimestampMixin):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # dequeue hot path: pending jobs ready to run
+        Index("ix_jobs_pending_runafter", "run_after", postgresql_where=text("status = 'pending'")),
+        # recover_stale_locks: processing jobs whose lock expired
+        Index("ix_jobs_stuck", "locked_at", postgresql_where=text("status = 'processing'")),
+    )
 
     job_type: Mapped[str] = mapped_column(String(64), nullable=False)
     
     # pending | processing | complete | failed
     status: Mapped[str] = mapped_column(String(32), default="pending")
-    # pending | locked | complete | failed
-    payload: Mapped[dict] = mapped_column(JSONB, default=dict)
+    # msgpack BYTEA: written once at enqueue, read once by the worker
+    payload: Mapped[dict] = mapped_column(MsgpackType, default=dict)
     result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
     attempts: Mapped[int] = mapped_column(Integer, default=0)
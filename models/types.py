@@ -0,0 +1,29 @@
+# models/types.py
+from __future__ import annotations
+
+from typing import Any
+
+import msgpack
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+
+class MsgpackType(TypeDecorator):
+    """
+    Stores a small dict/list as msgpack in a BYTEA column.
+
+    Cheaper than JSONB for hot rows that Postgres never has to look inside.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> bytes | None:
+        if value is None:
+            return None
+        return msgpack.packb(value, use_bin_type=True)
+
+    def process_result_value(self, value: bytes | None, dialect) -> Any:
+        if value is None:
+            return None
+        return msgpack.unpackb(value, raw=False)
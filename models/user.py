@@ -13,7 +13,8 @@ class User(Base, UUIDPrimaryKey, TimestampMixin):
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     email: Mapped[str | None] = mapped_column(String(255), unique=True, nullable=True)
 
-    devices = relationship("Device", back_populates="user", lazy="selectin")
-    conversations = relationship("Conversation", back_populates="user", lazy="selectin")
-    bot_profile = relationship("BotProfile", back_populates="user", uselist=False, lazy="selectin")
-    user_profile = relationship("UserProfile", back_populates="user", uselist=False, lazy="selectin")
+    # Loaded only on request via selectinload(...); every auth'd request fetches a User
+    devices = relationship("Device", back_populates="user", lazy="raise")
+    conversations = relationship("Conversation", back_populates="user", lazy="raise")
+    bot_profile = relationship("BotProfile", back_populates="user", uselist=False, lazy="raise")
+    user_profile = relationship("UserProfile", back_populates="user", uselist=False, lazy="raise")
@@ -0,0 +1,37 @@
+# scripts/export_emotion_model.py
+"""
+Export the transcript emotion classifier to INT8 ONNX.
+Run: python scripts/export_emotion_model.py /data/emotion_model
+Then set EMOTION_MODEL_PATH=/data/emotion_model for the worker.
+
+Needs (offline only): pip install "optimum[onnxruntime]"
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from optimum.onnxruntime import ORTModelForSequenceClassification
+from transformers import AutoTokenizer
+
+MODEL_ID = "j-hartmann/emotion-english-distilroberta-base"
+
+
+def export(out_dir: Path) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    model = ORTModelForSequenceClassification.from_pretrained(MODEL_ID, export=True)
+    model.save_pretrained(out_dir / "fp32")
+    AutoTokenizer.from_pretrained(MODEL_ID).save_pretrained(out_dir)  # writes tokenizer.json
+
+    quantize_dynamic(
+        str(out_dir / "fp32" / "model.onnx"),
+        str(out_dir / "model.onnx"),
+        weight_type=QuantType.QInt8,
+    )
+    print(f"✅ Quantized model written to {out_dir / 'model.onnx'}")
+
+
+if __name__ == "__main__":
+    export(Path(sys.argv[1] if len(sys.argv) > 1 else "/data/emotion_model"))
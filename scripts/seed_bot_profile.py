@@ -32,9 +32,12 @@ async def seed():
         else:
             user = User(name="Dev User", email="dev@companion.local")
             db.add(user)
-            await db.flush()
+            await db.flush([user])
             print(f"Created user: {user.id}")
 
+        # Dependent rows are collected and written with a single flush
+        new_rows = []
+
         # Device
         stmt = select(Device).where(Device.user_id == user.id)
         result = await db.execute(stmt)
@@ -46,9 +49,7 @@ async def seed():
                 label="dev-pi",
                 hw_model="Raspberry Pi 5",
             )
-            db.add(device)
-            await db.flush()
-            print(f"Created device: {device.id} (token: {device.token})")
+            new_rows.append(device)
 
         # Bot profile 
         stmt = select(BotProfile).where(BotProfile.user_id == user.id)
@@ -63,9 +64,7 @@ async def seed():
                 rules=DEFAULT_RULES,
                 favorite_modes=DEFAULT_MODES,
             )
-            db.add(bp)
-            await db.flush()
-            print(f"Created bot profile: {bp.id} ({bp.name})")
+            new_rows.append(bp)
 
         # User profile
         stmt = select(UserProfile).where(UserProfile.user_id == user.id)
@@ -78,9 +77,18 @@ async def seed():
                 interests={"topics": ["space", "dinosaurs", "minecraft"]},
                 preferences={"response_length": "short"},
             )
-            db.add(up)
+            new_rows.append(up)
+
+        if new_rows:
+            db.add_all(new_rows)
             await db.flush()
-            print(f"Created user profile: {up.id}")
+        for row in new_rows:
+            if isinstance(row, Device):
+                print(f"Created device: {row.id} (token: {row.token})")
+            elif isinstance(row, BotProfile):
+                print(f"Created bot profile: {row.id} ({row.name})")
+            else:
+                print(f"Created user profile: {row.id}")
 
         print("✅ Seed complete.")
 
@@ -2,23 +2,38 @@
 """
 Emotion detection pipeline.
 
-1. Primary: analyze audio tone features (stub — replace with a real model
-   like wav2vec2-emotion or a fine-tuned classifier).
-2. Fallback: sentiment analysis on the transcript via LLM.
+1. Primary: analyze audio tone features (not implemented yet — returns None
+   until a real model like wav2vec2-emotion or a fine-tuned classifier lands).
+2. Fallback: classify the transcript with a local INT8 ONNX model when one is
+   configured (see scripts/export_emotion_model.py), otherwise via LLM.
 """
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-import random
+import threading
 from dataclasses import dataclass
+from pathlib import Path
 
+import numpy as np
+import orjson
+
+from api.app.config import get_settings
 from services.openai_llm import extract_json
 
 logger = logging.getLogger(__name__)
 
 EMOTION_LABELS = ["neutral", "happy", "sad", "angry", "anxious", "excited", "tired"]
 
+# Output order of j-hartmann/emotion-english-distilroberta-base → our labels
+_MODEL_LABELS = ["angry", "angry", "anxious", "happy", "neutral", "sad", "excited"]
+_MAX_TOKENS = 128
+
+# (session, tokenizer) once loaded, False if unavailable, None if not tried yet
+_local_classifier = None
+# to_thread callers race on the first load; the lock keeps it to one
+_local_classifier_lock = threading.Lock()
+
 
 @dataclass
 class EmotionResult:
@@ -28,24 +43,84 @@ class EmotionResult:
 
 async def detect_emotion_from_audio(audio_path: str) -> EmotionResult | None:
     """
-    Stub: Analyze audio features for emotional tone.
+    Analyze audio features for emotional tone.
 
-    In production, replace with an actual audio emotion model
-    (e.g., HuggingFace wav2vec2-large-xlsr-53-emotion).
+    No audio model yet, so this returns None and detect_emotion always uses
+    the transcript path. In production, replace with an actual audio emotion
+    model (e.g., HuggingFace wav2vec2-large-xlsr-53-emotion).
     """
-    # ── STUB: random realistic output for development ──
+    return None
+
+
+def _get_local_classifier():
+    """Lazy-load the quantized ONNX classifier (optional `emotion` extra)."""
+    global _local_classifier
+    if _local_classifier is None:
+        with _local_classifier_lock:
+            if _local_classifier is None:
+                _local_classifier = _load_local_classifier()
+    return _local_classifier or None
+
+
+def _load_local_classifier():
+    model_dir = get_settings().emotion_model_path
+    if not model_dir:
+        return False
+
+    model_path = Path(model_dir) / "model.onnx"
+    if not model_path.exists():
+        logger.warning("Local emotion classifier unavailable: %s not found", model_path)
+        return False
+
     try:
-        label = random.choice(EMOTION_LABELS)
-        confidence = round(random.uniform(0.45, 0.95), 2)
-        logger.info("AudioEmotion(stub): %s @ %.2f", label, confidence)
-        return EmotionResult(label=label, confidence=confidence)
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = 1
+        session = ort.InferenceSession(
+            str(model_path),
+            sess_options=opts,
+            providers=["CPUExecutionProvider"],
+        )
+        tokenizer = Tokenizer.from_file(str(Path(model_dir) / "tokenizer.json"))
+        tokenizer.enable_truncation(max_length=_MAX_TOKENS)
     except Exception as exc:
-        logger.warning("Audio emotion detection failed: %s", exc)
+        logger.warning("Local emotion classifier unavailable: %s", exc)
+        return False
+
+    logger.info("Local emotion classifier loaded from %s", model_dir)
+    return (session, tokenizer)
+
+
+def _classify_locally(transcript: str) -> EmotionResult | None:
+    classifier = _get_local_classifier()
+    if classifier is None:
         return None
+    session, tokenizer = classifier
+
+    enc = tokenizer.encode(transcript)
+    logits = session.run(None, {
+        "input_ids": np.array([enc.ids], dtype=np.int64),
+        "attention_mask": np.array([enc.attention_mask], dtype=np.int64),
+    })[0][0]
+    probs = np.exp(logits - logits.max())
+    probs /= probs.sum()
+    idx = int(probs.argmax())
+    return EmotionResult(label=_MODEL_LABELS[idx], confidence=round(float(probs[idx]), 2))
 
 
 async def detect_emotion_from_transcript(transcript: str) -> EmotionResult:
-    """Fallback: use LLM to classify emotional tone from text."""
+    """Fallback: classify emotional tone from text (local model, else LLM)."""
+    # Only hop to a thread when a local model is configured and not known-bad
+    if _local_classifier is not False and get_settings().emotion_model_path:
+        try:
+            local = await asyncio.to_thread(_classify_locally, transcript)
+            if local is not None:
+                return local
+        except Exception as exc:
+            logger.warning("Local emotion classification failed: %s", exc)
+
     system = (
         "You are an emotion classifier. Given the user's transcript, respond with "
         'JSON: {"emotion": "<label>", "confidence": <float 0-1>}. '
@@ -53,7 +128,7 @@ async def detect_emotion_from_transcript(transcript: str) -> EmotionResult:
     )
     try:
         raw = await extract_json(system, transcript)
-        data = json.loads(raw)
+        data = orjson.loads(raw)
         return EmotionResult(
             label=data.get("emotion", "neutral"),
             confidence=float(data.get("confidence", 0.5)),
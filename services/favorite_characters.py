@@ -1,4 +1,5 @@
 # services/favorite_characters.py
+import re
 
 from services.memory_service import retrieve_relevant_memories
 
@@ -11,6 +12,12 @@ CHARACTER_HINTS = [
     "peppa pig",
 ]
 
+# One pass over each memory instead of a substring scan per hint
+# (longest first so overlapping hints prefer the longer name)
+_HINT_RE = re.compile(
+    "|".join(re.escape(h) for h in sorted(CHARACTER_HINTS, key=len, reverse=True))
+)
+
 async def get_favorite_characters(db, user_id):
     memories = await retrieve_relevant_memories(
         db,
@@ -22,10 +29,6 @@ async def get_favorite_characters(db, user_id):
     found = set()
 
     for mem in memories:
-        text = mem.content.lower()
-
-        for c in CHARACTER_HINTS:
-            if c in text:
-                found.add(c)
+        found.update(_HINT_RE.findall(mem.content.lower()))
 
     return list(found)
@@ -4,20 +4,55 @@ Memory service: extract, embed, store, and retrieve long-term memories.
 """
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+import re
 import uuid
+from collections import OrderedDict
 
-from sqlalchemy import select, text
+import numpy as np
+import orjson
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import String, bindparam, cast, func, insert, select, text
+from sqlalchemy.dialects.postgresql import BIT
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.memory import Memory
-from models.memory_embedding import MemoryEmbedding
-from services.openai_embeddings import generate_embedding
+from models.memory_embedding import EMBEDDING_DIM, MemoryEmbedding
+from services.openai_embeddings import generate_embedding, generate_embeddings
 from services.openai_llm import extract_json
 
 logger = logging.getLogger(__name__)
 
+# Candidates pulled from the binary-quantized index before exact re-ranking
+RERANK_CANDIDATES = 50
+# HNSW candidate list size per query; must cover RERANK_CANDIDATES
+HNSW_EF_SEARCH = 100
+# pgvector release that added hnsw.iterative_scan
+ITERATIVE_SCAN_MIN_VERSION = (0, 8)
+
+# Checked once per process (None until then)
+_iterative_scan_supported: bool | None = None
+
+# Query strings repeat (e.g. the favorite-characters lookup), so their
+# embeddings are kept in an in-process LRU
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+_query_embedding_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+
+# Short transcripts whose preferences the rules already caught skip the LLM
+RULE_FAST_PATH_MAX_CHARS = 200
+
+# Utterance prefix → memory phrasing
+_PREFERENCE_PREFIXES = {
+    "i like ": "Likes ",
+    "i love ": "Loves ",
+    "my favorite ": "Favorite ",
+    "my favourite ": "Favorite ",
+}
+_VAGUE_OBJECTS = {"it", "that", "this", "them", "you"}
+_SENTENCE_SPLIT = re.compile(r"[.!?]+")
+
 EXTRACTION_PROMPT = """You are a memory extractor for a conversational AI companion.
 Given the user's message and the assistant's reply, extract facts, preferences,
 events, or emotional states worth remembering long-term.
@@ -38,12 +73,40 @@ If there is nothing worth remembering, return {"memories": []}.
 """
 
 
+def rule_based_memory_candidates(transcript: str) -> list[str]:
+    """Pick out plain preference statements ("I like ...", "my favorite ...")."""
+    candidates: list[str] = []
+    for sentence in _SENTENCE_SPLIT.split(transcript or ""):
+        sentence = sentence.strip()
+        lowered = sentence.lower()
+        for prefix, phrasing in _PREFERENCE_PREFIXES.items():
+            if lowered.startswith(prefix):
+                rest = sentence[len(prefix):].strip(" ,")
+                if rest and rest.lower() not in _VAGUE_OBJECTS:
+                    candidates.append(phrasing + rest)
+                break
+    return candidates
+
+
 async def extract_memories(
     transcript: str,
     assistant_reply: str,
     detected_emotion: str | None = None,
 ) -> list[dict]:
-    """Use LLM to extract memorable facts from an interaction."""
+    """Extract memorable facts from an interaction (rules first, then LLM)."""
+    candidates = rule_based_memory_candidates(transcript)
+    if candidates and len(transcript) < RULE_FAST_PATH_MAX_CHARS:
+        logger.info("Extracted %d memories by rule", len(candidates))
+        return [
+            {
+                "content": c,
+                "category": "preference",
+                "emotional_context": detected_emotion,
+                "salience": 0.6,
+            }
+            for c in candidates
+        ]
+
     user_input = (
         f"User said: {transcript}\n"
         f"Assistant replied: {assistant_reply}\n"
@@ -51,7 +114,7 @@ async def extract_memories(
     )
     try:
         raw = await extract_json(EXTRACTION_PROMPT, user_input)
-        data = json.loads(raw)
+        data = orjson.loads(raw)
         memories = data.get("memories", [])
         logger.info("Extracted %d memories", len(memories))
         return memories
@@ -68,8 +131,9 @@ async def store_memory(
     category: str = "general",
     emotional_context: str | None = None,
     salience_score: float = 0.5,
+    embedding: np.ndarray | None = None,
 ) -> Memory:
-    """Store a memory and its embedding."""
+    """Store a memory and its embedding (generated here unless precomputed)."""
     memory = Memory(
         user_id=user_id,
         interaction_id=interaction_id,
@@ -83,7 +147,7 @@ async def store_memory(
 
     # Generate and store embedding
     try:
-        vector = await generate_embedding(content)
+        vector = embedding if embedding is not None else await generate_embedding(content)
         emb = MemoryEmbedding(memory_id=memory.id, embedding=vector)
         db.add(emb)
         await db.flush()
@@ -93,6 +157,116 @@ async def store_memory(
     return memory
 
 
+async def bulk_store_memories(
+    db: AsyncSession,
+    rows: list[dict],
+    vectors: list[np.ndarray | None],
+) -> list[uuid.UUID]:
+    """
+    Insert memory rows, then their embeddings, with one batched
+    INSERT ... RETURNING per table regardless of how many rows.
+    """
+    if not rows:
+        return []
+
+    result = await db.execute(
+        insert(Memory).returning(Memory.id, sort_by_parameter_order=True),
+        rows,
+    )
+    ids = list(result.scalars().all())
+
+    embeddings = [
+        {"memory_id": memory_id, "embedding": vector}
+        for memory_id, vector in zip(ids, vectors)
+        if vector is not None
+    ]
+    if embeddings:
+        await db.execute(insert(MemoryEmbedding), embeddings)
+    return ids
+
+
+async def store_memories(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    interaction_id: uuid.UUID | None,
+    memories: list[dict],
+) -> list[uuid.UUID]:
+    """
+    Store extracted memories, embedding all contents in a single request
+    before any rows are written.
+    """
+    if not memories:
+        return []
+
+    contents = [m["content"] for m in memories]
+    try:
+        vectors: list = list(await generate_embeddings(contents))
+    except Exception as exc:
+        logger.warning("Batch embedding failed, embedding memories one by one: %s", exc)
+        vectors = await asyncio.gather(
+            *(generate_embedding(content) for content in contents),
+            return_exceptions=True,
+        )
+
+    # A memory without an embedding can never be retrieved, so it isn't stored
+    rows = []
+    kept_vectors = []
+    for mem, vector in zip(memories, vectors):
+        if isinstance(vector, BaseException):
+            logger.warning("Embedding failed, dropping memory %r: %s", mem["content"], vector)
+            continue
+        rows.append(
+            {
+                "user_id": user_id,
+                "interaction_id": interaction_id,
+                "content": mem["content"],
+                "category": mem.get("category", "general"),
+                "emotional_context": mem.get("emotional_context"),
+                "salience_score": float(mem.get("salience", 0.5)),
+            }
+        )
+        kept_vectors.append(vector)
+
+    if not rows:
+        return []
+    async with db.begin_nested():
+        return await bulk_store_memories(db, rows, kept_vectors)
+
+
+async def _embed_query(query: str) -> np.ndarray:
+    """Embedding for a retrieval query, served from the LRU when seen before."""
+    cached = _query_embedding_cache.get(query)
+    if cached is not None:
+        _query_embedding_cache.move_to_end(query)
+        return cached
+
+    vector = await generate_embedding(query)
+    _query_embedding_cache[query] = vector
+    if len(_query_embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+        _query_embedding_cache.popitem(last=False)
+    return vector
+
+
+async def _supports_iterative_scan(db: AsyncSession) -> bool:
+    """
+    Whether the installed pgvector has hnsw.iterative_scan (>= 0.8). Older
+    versions reject the SET and abort the transaction, so check first.
+    """
+    global _iterative_scan_supported
+    if _iterative_scan_supported is None:
+        version = (
+            await db.execute(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'"))
+        ).scalar_one_or_none()
+        parts = tuple(int(p) for p in re.findall(r"\d+", version or "")[:2])
+        _iterative_scan_supported = parts >= ITERATIVE_SCAN_MIN_VERSION
+        if not _iterative_scan_supported:
+            logger.warning(
+                "pgvector %s has no hnsw.iterative_scan; memory retrieval may miss candidates",
+                version,
+            )
+    return _iterative_scan_supported
+
+
 async def retrieve_relevant_memories(
     db: AsyncSession,
     user_id: uuid.UUID,
@@ -101,7 +275,7 @@ async def retrieve_relevant_memories(
 ) -> list[Memory]:
     """Retrieve the most relevant memories using cosine similarity on pgvector."""
     try:
-        query_embedding = await generate_embedding(query)
+        query_embedding = await _embed_query(query)
     except Exception as exc:
         logger.warning("Query embedding failed: %s", exc)
         # Fallback: return most recent salient memories
@@ -114,14 +288,34 @@ async def retrieve_relevant_memories(
         result = await db.execute(stmt)
         return list(result.scalars().all())
 
-    # pgvector cosine distance search
+    # 1) candidates by hamming distance on 1-bit codes (ix_mem_emb_bq_hnsw)
+    # 2) exact cosine distance re-ranks just those candidates
+    await db.execute(text(f"SET LOCAL hnsw.ef_search = {HNSW_EF_SEARCH}"))
+    # The index spans all users; keep scanning past ef_search until the
+    # user_id filter has RERANK_CANDIDATES rows. Step 2 re-sorts, so the
+    # approximate order of relaxed_order is enough
+    if await _supports_iterative_scan(db):
+        await db.execute(text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+    # pgvector's text form is a JSON array; orjson writes it in C rather than
+    # the Vector type formatting 1536 floats one by one in Python
+    query_text = orjson.dumps(query_embedding, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    query_vec = cast(bindparam("query_embedding", query_text, type_=String), Vector(EMBEDDING_DIM))
+
+    def _bits(vec):
+        return cast(func.binary_quantize(vec), BIT(EMBEDDING_DIM))
+
+    candidates = (
+        select(MemoryEmbedding.memory_id, MemoryEmbedding.embedding)
+        .join(Memory, Memory.id == MemoryEmbedding.memory_id)
+        .where(Memory.user_id == user_id)
+        .order_by(_bits(MemoryEmbedding.embedding).op("<~>")(_bits(query_vec)))
+        .limit(RERANK_CANDIDATES)
+        .subquery()
+    )
     stmt = (
         select(Memory)
-        .join(MemoryEmbedding, MemoryEmbedding.memory_id == Memory.id)
-        .where(Memory.user_id == user_id)
-        .order_by(
-            MemoryEmbedding.embedding.cosine_distance(query_embedding)
-        )
+        .join(candidates, candidates.c.memory_id == Memory.id)
+        .order_by(candidates.c.embedding.cosine_distance(query_vec))
         .limit(limit)
     )
     result = await db.execute(stmt)
@@ -4,14 +4,24 @@ Structured event logging to the events table.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db.session import get_db
 from models.event import Event
 
 logger = logging.getLogger(__name__)
 
+# Background event writes that may hold a DB session at once
+EVENT_WRITE_CONCURRENCY = 4
+# How long shutdown waits for queued event writes
+EVENT_DRAIN_TIMEOUT_SECONDS = 5.0
+
+_event_slots = asyncio.Semaphore(EVENT_WRITE_CONCURRENCY)
+_pending_events: set[asyncio.Task] = set()
+
 
 async def log_event(
     db: AsyncSession,
@@ -39,3 +49,43 @@ async def log_event(
         metadata or {},
     )
     return event
+
+
+async def _write_event(event_type: str, level: str, **fields) -> None:
+    async with _event_slots:
+        try:
+            async for db in get_db():
+                await log_event(db, event_type, level, **fields)
+        except Exception as exc:
+            logger.warning("Failed to write %s event: %s", event_type, exc)
+
+
+def emit_event(
+    event_type: str,
+    level: str = "info",
+    source: str | None = None,
+    message: str | None = None,
+    metadata: dict | None = None,
+) -> None:
+    """
+    Fire-and-forget log_event: written in the background in a session of its
+    own, so the caller's transaction and response don't wait on it. Call it
+    after the caller's commit, so rolled-back work is never logged.
+    """
+    task = asyncio.create_task(
+        _write_event(event_type, level, source=source, message=message, metadata=metadata)
+    )
+    _pending_events.add(task)
+    task.add_done_callback(_pending_events.discard)
+
+
+async def drain_events(timeout: float = EVENT_DRAIN_TIMEOUT_SECONDS) -> None:
+    """Wait for background event writes still in flight (call on shutdown)."""
+    if not _pending_events:
+        return
+    _, pending = await asyncio.wait(set(_pending_events), timeout=timeout)
+    if pending:
+        logger.warning("Dropping %d event writes still pending at shutdown", len(pending))
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
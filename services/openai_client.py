@@ -0,0 +1,26 @@
+# services/openai_client.py
+from __future__ import annotations
+
+from functools import lru_cache
+
+import httpx
+from openai import AsyncOpenAI
+
+from api.app.config import get_settings
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> AsyncOpenAI:
+    """
+    Returns a process-wide AsyncOpenAI client so every call reuses
+    one keep-alive connection pool instead of a fresh TLS handshake.
+    """
+    settings = get_settings()
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        max_retries=2,
+        timeout=30,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        ),
+    )
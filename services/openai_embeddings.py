@@ -1,23 +1,48 @@
 # services/openai_embeddings.py
 from __future__ import annotations
 
+import base64
 import logging
 
-from openai import AsyncOpenAI
+import numpy as np
 
 from api.app.config import get_settings
+from services.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
 
-async def generate_embedding(text: str) -> list[float]:
+def _decode(data: str) -> np.ndarray:
+    """base64 little-endian float32 payload → 1-D float32 array (no per-float parsing)."""
+    return np.frombuffer(base64.b64decode(data), dtype="<f4")
+
+
+async def generate_embedding(text: str) -> np.ndarray:
     """Generate an embedding vector for a piece of text."""
     settings = get_settings()
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    client = get_openai_client()
 
     logger.info("Embedding: generating for %d chars", len(text))
     response = await client.embeddings.create(
         model=settings.openai_embedding_model,
         input=text,
+        encoding_format="base64",
+    )
+    return _decode(response.data[0].embedding)
+
+
+async def generate_embeddings(texts: list[str]) -> list[np.ndarray]:
+    """Embed several texts in one request; vectors are returned in input order."""
+    if not texts:
+        return []
+
+    settings = get_settings()
+    client = get_openai_client()
+
+    logger.info("Embedding: generating batch of %d", len(texts))
+    response = await client.embeddings.create(
+        model=settings.openai_embedding_model,
+        input=texts,
+        encoding_format="base64",
     )
-    return response.data[0].embedding
+    return [_decode(d.embedding) for d in sorted(response.data, key=lambda d: d.index)]
@@ -1,14 +1,63 @@
 # services/openai_llm.py
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
-
-from openai import AsyncOpenAI
+import re
+import time
+from collections import OrderedDict
 
 from api.app.config import get_settings
+from services.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
+# In-process LRU of replies for stock greeting/thanks turns. Entries expire
+# so even those replies keep varying over a session.
+REPLY_CACHE_SIZE = 10_000
+REPLY_CACHE_TTL_SECONDS = 600
+CACHEABLE_HISTORY_TURNS = 4
+CACHEABLE_MESSAGES = frozenset({
+    "hi", "hii", "hello", "hey", "hi there", "hello there", "hey there",
+    "good morning", "good afternoon", "good evening", "good night", "goodnight",
+    "thanks", "thank you", "thank you so much", "thanks a lot",
+    "bye", "bye bye", "goodbye",
+})
+
+_NOT_WORD = re.compile(r"[^\w\s']+")
+
+# key → (expires_at monotonic seconds, reply)
+_reply_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+
+def _reply_cache_key(
+    system_prompt: str,
+    user_message: str,
+    conversation_history: list[dict] | None,
+) -> str | None:
+    """Cache key for a stock greeting/thanks turn, or None if the turn isn't one."""
+    history = conversation_history or []
+    if len(history) > CACHEABLE_HISTORY_TURNS:
+        return None
+    normalized = " ".join(_NOT_WORD.sub(" ", user_message.lower()).split())
+    if normalized not in CACHEABLE_MESSAGES:
+        return None
+    raw = "\x00".join((system_prompt, normalized, json.dumps(history)))
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _cached_reply(key: str) -> str | None:
+    entry = _reply_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, reply = entry
+    if expires_at <= time.monotonic():
+        del _reply_cache[key]
+        return None
+    _reply_cache.move_to_end(key)
+    return reply
+
 
 async def chat_completion(
     system_prompt: str,
@@ -16,10 +65,22 @@ async def chat_completion(
     conversation_history: list[dict] | None = None,
     temperature: float = 0.8,
     max_tokens: int = 512,
+    use_cache: bool = False,
 ) -> str:
-    """Run an LLM chat completion and return the assistant message text."""
+    """
+    Run an LLM chat completion and return the assistant message text.
+
+    With use_cache, greeting/thanks turns reuse a recent reply for the same prompt.
+    """
+    key = _reply_cache_key(system_prompt, user_message, conversation_history) if use_cache else None
+    if key is not None:
+        cached = _cached_reply(key)
+        if cached is not None:
+            logger.info("LLM: reply cache hit")
+            return cached
+
     settings = get_settings()
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    client = get_openai_client()
 
     messages: list[dict] = [{"role": "system", "content": system_prompt}]
     if conversation_history:
@@ -35,13 +96,19 @@ async def chat_completion(
     )
     text = response.choices[0].message.content or ""
     logger.info("LLM: got %d chars response", len(text))
+
+    if key is not None and text:
+        _reply_cache[key] = (time.monotonic() + REPLY_CACHE_TTL_SECONDS, text)
+        _reply_cache.move_to_end(key)
+        if len(_reply_cache) > REPLY_CACHE_SIZE:
+            _reply_cache.popitem(last=False)
     return text
 
 
 async def extract_json(system_prompt: str, user_message: str) -> str:
     """Run a completion expecting JSON output (for memory extraction, etc.)."""
     settings = get_settings()
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    client = get_openai_client()
 
     response = await client.chat.completions.create(
         model=settings.openai_model,
@@ -1,11 +1,12 @@
 # services/openai_stt.py
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
 
-from openai import AsyncOpenAI
 from api.app.config import get_settings
+from services.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -15,21 +16,17 @@ class NonRetryableJobError(Exception):
     pass
 
 
-def _validate_audio_file(path: Path) -> None:
-    if not path.exists():
-        raise NonRetryableJobError(f"Audio file does not exist: {path}")
-
-    size = path.stat().st_size
+def _validate_audio_file(path: Path, data: bytes) -> None:
+    size = len(data)
     if size < 1024:  # way too small to be real audio
-        head = path.read_bytes()
-        text_preview = head.decode("utf-8", errors="replace")
+        text_preview = data.decode("utf-8", errors="replace")
 
         raise NonRetryableJobError(
             f"Audio file too small ({size} bytes). "
             f"Likely not real audio. Preview:\n{text_preview}"
         )
 
-    head = path.read_bytes()[:16]
+    head = data[:16]
 
     # Validate WAV container if extension says .wav
     if path.suffix.lower() == ".wav":
@@ -41,21 +38,26 @@ def _validate_audio_file(path: Path) -> None:
 
 async def transcribe_audio(audio_path: str | Path) -> str:
     settings = get_settings()
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    client = get_openai_client()
 
     path = Path(audio_path)
 
     logger.info("STT: transcribing %s", path)
 
+    if not path.exists():
+        raise NonRetryableJobError(f"Audio file does not exist: {path}")
+
+    # Read once off the event loop; validation and upload share the buffer
+    data = await asyncio.to_thread(path.read_bytes)
+
     # ✅ Validate before sending to OpenAI
-    _validate_audio_file(path)
+    _validate_audio_file(path, data)
 
-    with path.open("rb") as f:
-        response = await client.audio.transcriptions.create(
-            model=settings.openai_stt_model,
-            file=f,
-            response_format="text",
-        )
+    response = await client.audio.transcriptions.create(
+        model=settings.openai_stt_model,
+        file=(path.name, data),
+        response_format="text",
+    )
 
     transcript = response.strip()
     logger.info("STT: got %d chars", len(transcript))
@@ -1,32 +1,73 @@
 # services/openai_tts.py
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
 
-from openai import AsyncOpenAI
+import aiofiles
 
 from api.app.config import get_settings
+from services.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
+STREAM_CHUNK_BYTES = 4096
+# Enough audio on disk for a client to start playback
+STREAM_READY_BYTES = 16 * 1024
 
-async def synthesize_speech(text: str, output_path: str | Path, voice: str | None = None) -> Path:
-    """Generate speech audio from text and save to output_path."""
+
+def partial_path(output_path: str | Path) -> Path:
+    """Where audio for output_path is streamed while synthesis is in progress."""
+    out = Path(output_path)
+    return out.with_name(out.name + ".part")
+
+
+async def synthesize_speech(
+    text: str,
+    output_path: str | Path,
+    voice: str | None = None,
+    ready: asyncio.Event | None = None,
+) -> Path:
+    """
+    Stream speech audio for text to output_path.
+
+    Chunks are written to a `.part` file as they arrive; `ready` is set once
+    STREAM_READY_BYTES are on disk. The file only moves to output_path after
+    the full response was written, so an existing output_path is always complete.
+    """
     settings = get_settings()
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    client = get_openai_client()
     out = Path(output_path)
     out.parent.mkdir(parents=True, exist_ok=True)
+    part = partial_path(out)
 
     voice = voice or settings.openai_tts_voice
     logger.info("TTS: synthesizing %d chars with voice=%s", len(text), voice)
 
-    response = await client.audio.speech.create(
+    written = 0
+    async with client.audio.speech.with_streaming_response.create(
         model=settings.openai_tts_model,
         voice=voice,
         input=text,
         response_format="wav",
-    )
-    response.stream_to_file(str(out))
-    logger.info("TTS: saved to %s", out)
+    ) as response:
+        # Content-Length counts encoded bytes; iter_bytes yields decoded ones
+        encoding = response.headers.get("content-encoding", "identity").lower()
+        expected = response.headers.get("content-length") if encoding == "identity" else None
+        async with aiofiles.open(part, "wb") as f:
+            async for chunk in response.iter_bytes(STREAM_CHUNK_BYTES):
+                await f.write(chunk)
+                written += len(chunk)
+                if ready is not None and not ready.is_set() and written >= STREAM_READY_BYTES:
+                    await f.flush()
+                    ready.set()
+
+    if expected is not None and int(expected) != written:
+        raise IOError(f"TTS stream truncated: {written}/{expected} bytes")
+
+    part.replace(out)
+    if ready is not None:
+        ready.set()  # short replies may never reach the threshold
+    logger.info("TTS: saved %d bytes to %s", written, out)
     return out
@@ -2,8 +2,12 @@
 from __future__ import annotations
 
 import uuid
+from unittest.mock import AsyncMock
+
 import pytest
 
+from tests.wake_word import create_porcupine
+
 
 @pytest.fixture
 def sample_traits() -> dict:
@@ -19,3 +23,20 @@ def sample_traits() -> dict:
 @pytest.fixture
 def sample_user_id() -> uuid.UUID:
     return uuid.uuid4()
+
+
+@pytest.fixture
+def extract_json_mock(monkeypatch) -> AsyncMock:
+    """Stands in for the memory extractor's LLM call; set return_value/side_effect per test."""
+    mock = AsyncMock()
+    monkeypatch.setattr("services.memory_service.extract_json", mock)
+    return mock
+
+
+@pytest.fixture(scope="session")
+def porcupine():
+    """Wake-word engine (built-in "porcupine" keyword), loaded once per session."""
+    pytest.importorskip("pvporcupine")
+    engine = create_porcupine()
+    yield engine
+    engine.delete()
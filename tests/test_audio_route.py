@@ -0,0 +1,63 @@
+# tests/test_audio_route.py
+"""Tests for serving audio while TTS is still writing the `.part` file."""
+from __future__ import annotations
+
+import asyncio
+
+import aiofiles
+import pytest
+
+from api.app.routes import audio
+
+
+async def _collect(final_path, part_path) -> bytes:
+    part_file = await aiofiles.open(part_path, "rb")
+    out = b""
+    async for chunk in audio._tail_partial(final_path, part_path, part_file):
+        out += chunk
+    return out
+
+
+@pytest.fixture
+def paths(tmp_path):
+    final_path = tmp_path / "reply.wav"
+    part_path = tmp_path / "reply.wav.part"
+    part_path.write_bytes(b"RIFF")
+    return final_path, part_path
+
+
+@pytest.mark.asyncio
+async def test_tail_follows_growth_until_rename(paths):
+    final_path, part_path = paths
+    reader = asyncio.create_task(_collect(final_path, part_path))
+
+    await asyncio.sleep(0.1)
+    with part_path.open("ab") as f:
+        f.write(b"more-audio")
+    await asyncio.sleep(0.1)
+    with part_path.open("ab") as f:
+        f.write(b"-last")  # lands right before the rename
+    part_path.replace(final_path)
+
+    body = await asyncio.wait_for(reader, timeout=2)
+    assert body == b"RIFFmore-audio-last"
+
+
+@pytest.mark.asyncio
+async def test_tail_stops_when_part_is_unlinked(paths):
+    final_path, part_path = paths
+    reader = asyncio.create_task(_collect(final_path, part_path))
+
+    await asyncio.sleep(0.1)
+    part_path.unlink()  # TTS failed
+
+    assert await asyncio.wait_for(reader, timeout=2) == b"RIFF"
+
+
+@pytest.mark.asyncio
+async def test_tail_gives_up_when_part_stops_growing(paths, monkeypatch):
+    final_path, part_path = paths
+    monkeypatch.setattr(audio, "TAIL_IDLE_TIMEOUT_SECONDS", 0.2)
+
+    assert await asyncio.wait_for(_collect(final_path, part_path), timeout=2) == b"RIFF"
+    assert part_path.exists()
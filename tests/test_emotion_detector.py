@@ -2,12 +2,16 @@
 """Tests for the emotion detection pipeline."""
 from __future__ import annotations
 
+import math
+import sys
+import types
 from unittest.mock import AsyncMock, patch
 
+import numpy as np
 import pytest
 
+import services.emotion_detector as emotion_detector
 from services.emotion_detector import (
-    EMOTION_LABELS,
     EmotionResult,
     detect_emotion,
     detect_emotion_from_audio,
@@ -15,12 +19,16 @@ from services.emotion_detector import (
 )
 
 
+@pytest.fixture(autouse=True)
+def no_local_model(monkeypatch):
+    """Default: no local emotion model configured, nothing loaded yet."""
+    _use_model_dir(monkeypatch, None)
+
+
 @pytest.mark.asyncio
-async def test_audio_emotion_returns_valid_label():
+async def test_audio_emotion_not_available():
     result = await detect_emotion_from_audio("/tmp/fake.wav")
-    assert result is not None
-    assert result.label in EMOTION_LABELS
-    assert 0.0 <= result.confidence <= 1.0
+    assert result is None
 
 
 @pytest.mark.asyncio
@@ -50,3 +58,93 @@ async def test_full_pipeline_falls_back_to_transcript():
     ):
         result = await detect_emotion("/tmp/fake.wav", "I'm feeling down today")
     assert result.label == "sad"
+
+
+class _StubEncoding:
+    ids = [0, 31414, 2]
+    attention_mask = [1, 1, 1]
+
+
+class _StubTokenizer:
+    def encode(self, text):
+        return _StubEncoding()
+
+
+class _StubSession:
+    def __init__(self, logits):
+        self.logits = logits
+        self.feeds = None
+
+    def run(self, output_names, feeds):
+        self.feeds = feeds
+        return [np.array([self.logits], dtype=np.float32)]
+
+
+def _use_model_dir(monkeypatch, model_dir):
+    monkeypatch.setattr(emotion_detector, "_local_classifier", None)
+    monkeypatch.setattr(
+        emotion_detector,
+        "get_settings",
+        lambda: types.SimpleNamespace(emotion_model_path=str(model_dir) if model_dir else None),
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_classifier_maps_softmax_to_label(monkeypatch):
+    # Model index 3 is "joy" → happy
+    session = _StubSession([0.0, 0.0, 0.0, 3.0, 0.0, 0.0, 0.0])
+    _use_model_dir(monkeypatch, "/models/emotion")
+    monkeypatch.setattr(emotion_detector, "_local_classifier", (session, _StubTokenizer()))
+    with patch("services.emotion_detector.extract_json", new_callable=AsyncMock) as llm:
+        result = await detect_emotion_from_transcript("I got a puppy!")
+
+    llm.assert_not_awaited()
+    assert result.label == "happy"
+    assert result.confidence == round(math.exp(3) / (math.exp(3) + 6), 2)
+    assert session.feeds["input_ids"].dtype == np.int64
+    assert session.feeds["input_ids"].tolist() == [[0, 31414, 2]]
+
+
+@pytest.mark.asyncio
+async def test_missing_model_file_falls_back_to_llm(monkeypatch, tmp_path):
+    _use_model_dir(monkeypatch, tmp_path)  # no model.onnx in here
+    mock_json = '{"emotion": "sad", "confidence": 0.6}'
+    with patch("services.emotion_detector.extract_json", new_callable=AsyncMock, return_value=mock_json):
+        result = await detect_emotion_from_transcript("I lost my toy")
+
+    assert result.label == "sad"
+    assert emotion_detector._local_classifier is False
+
+
+@pytest.mark.asyncio
+async def test_model_load_error_falls_back_to_llm(monkeypatch, tmp_path):
+    (tmp_path / "model.onnx").write_bytes(b"not a model")
+    _use_model_dir(monkeypatch, tmp_path)
+
+    def _broken_session(*args, **kwargs):
+        raise RuntimeError("INVALID_PROTOBUF")
+
+    fake_ort = types.SimpleNamespace(SessionOptions=types.SimpleNamespace, InferenceSession=_broken_session)
+    monkeypatch.setitem(sys.modules, "onnxruntime", fake_ort)
+    monkeypatch.setitem(sys.modules, "tokenizers", types.SimpleNamespace(Tokenizer=None))
+
+    mock_json = '{"emotion": "tired", "confidence": 0.7}'
+    with patch("services.emotion_detector.extract_json", new_callable=AsyncMock, return_value=mock_json):
+        result = await detect_emotion_from_transcript("I'm sleepy")
+
+    assert result.label == "tired"
+    assert emotion_detector._local_classifier is False
+
+
+@pytest.mark.asyncio
+async def test_no_model_configured_skips_the_thread_hop():
+    mock_json = '{"emotion": "happy", "confidence": 0.9}'
+    with (
+        patch("services.emotion_detector.asyncio.to_thread", new_callable=AsyncMock) as to_thread,
+        patch("services.emotion_detector.extract_json", new_callable=AsyncMock, return_value=mock_json),
+    ):
+        result = await detect_emotion_from_transcript("yay")
+
+    to_thread.assert_not_awaited()
+    assert result.label == "happy"
+    assert emotion_detector._local_classifier is None
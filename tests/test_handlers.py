@@ -0,0 +1,126 @@
+# tests/test_handlers.py
+"""Tests for job handler helpers (statements compiled, no database)."""
+from __future__ import annotations
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm.attributes import instance_state
+
+from jobs.handlers import patch_pending_slots, stream_reply_audio
+from models.conversation import Conversation
+from services.openai_tts import partial_path
+
+
+def _mock_db() -> MagicMock:
+    db = MagicMock()
+    db.execute = AsyncMock()
+    return db
+
+
+def _executed(db: MagicMock):
+    stmt = db.execute.await_args.args[0]
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return " ".join(str(compiled).split()), compiled.params
+
+
+@pytest.mark.asyncio
+async def test_patch_pending_slots_single_key():
+    conversation = Conversation(id=uuid.uuid4(), pending_slots=None)
+    db = _mock_db()
+
+    await patch_pending_slots(db, conversation, awaiting="story_topic")
+
+    sql, params = _executed(db)
+    assert sql == (
+        "UPDATE conversations SET pending_slots=jsonb_set("
+        "coalesce(conversations.pending_slots, %(param_1)s::JSONB), "
+        "CAST(%(param_2)s::TEXT[] AS TEXT[]), %(param_3)s::JSONB), "
+        "updated_at=now() WHERE conversations.id = %(id_1)s::UUID"
+    )
+    assert params["param_1"] == {}
+    assert params["param_2"] == ["awaiting"]
+    assert params["param_3"] == "story_topic"
+    assert params["id_1"] == conversation.id
+    assert conversation.pending_slots == {"awaiting": "story_topic"}
+
+
+@pytest.mark.asyncio
+async def test_patch_pending_slots_nests_one_jsonb_set_per_key():
+    conversation = Conversation(id=uuid.uuid4(), pending_slots={"character": "Rex", "awaiting": "topic"})
+    db = _mock_db()
+
+    await patch_pending_slots(db, conversation, awaiting=None, story_turns=2)
+
+    sql, params = _executed(db)
+    # innermost call patches the first key, the outer one the second
+    assert sql.startswith(
+        "UPDATE conversations SET pending_slots=jsonb_set(jsonb_set("
+        "coalesce(conversations.pending_slots, %(param_1)s::JSONB), "
+        "CAST(%(param_2)s::TEXT[] AS TEXT[]), %(param_3)s::JSONB), "
+        "CAST(%(param_4)s::TEXT[] AS TEXT[]), %(param_5)s::JSONB)"
+    )
+    assert (params["param_2"], params["param_3"]) == (["awaiting"], None)
+    assert (params["param_4"], params["param_5"]) == (["story_turns"], 2)
+
+    assert conversation.pending_slots == {"character": "Rex", "awaiting": None, "story_turns": 2}
+    # synced as the committed value, so the next flush won't rewrite the blob
+    assert "pending_slots" not in instance_state(conversation).committed_state
+
+
+def _fake_tts(fail_after_ready: bool = False, hang: bool = False):
+    """Stands in for synthesize_speech: writes a .part file, then finishes or fails."""
+    async def synthesize(text, output_path, voice=None, ready=None):
+        part = partial_path(output_path)
+        part.write_bytes(b"RIFF")
+        ready.set()
+        await asyncio.sleep(0.01)
+        if hang:
+            await asyncio.sleep(60)
+        if fail_after_ready:
+            raise IOError("TTS stream truncated")
+        part.replace(output_path)
+        return output_path
+
+    return synthesize
+
+
+@pytest.mark.asyncio
+async def test_stream_reply_audio_publishes_streaming_then_completes(tmp_path, monkeypatch):
+    monkeypatch.setattr("jobs.handlers.synthesize_speech", _fake_tts())
+    audio_out = tmp_path / "reply.wav"
+    on_streaming = AsyncMock()
+
+    await stream_reply_audio("hi", audio_out, "nova", on_streaming=on_streaming)
+
+    on_streaming.assert_awaited_once()
+    assert audio_out.read_bytes() == b"RIFF"
+
+
+@pytest.mark.asyncio
+async def test_stream_reply_audio_removes_part_file_when_tts_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr("jobs.handlers.synthesize_speech", _fake_tts(fail_after_ready=True))
+    audio_out = tmp_path / "reply.wav"
+
+    with pytest.raises(IOError):
+        await stream_reply_audio("hi", audio_out, "nova", on_streaming=AsyncMock())
+
+    assert not audio_out.exists()
+    assert not partial_path(audio_out).exists()
+
+
+@pytest.mark.asyncio
+async def test_stream_reply_audio_cancels_tts_when_publishing_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr("jobs.handlers.synthesize_speech", _fake_tts(hang=True))
+    audio_out = tmp_path / "reply.wav"
+    on_streaming = AsyncMock(side_effect=RuntimeError("commit failed"))
+
+    with pytest.raises(RuntimeError, match="commit failed"):
+        await asyncio.wait_for(stream_reply_audio("hi", audio_out, "nova", on_streaming=on_streaming), timeout=2)
+
+    assert not partial_path(audio_out).exists()
+    leftover = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    assert leftover == []
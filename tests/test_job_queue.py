@@ -8,12 +8,18 @@ For full integration tests, use a PostgreSQL test container.
 from __future__ import annotations
 
 import uuid
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
+from jobs.payloads import ProcessVoicePayload
+from jobs.queue import LOCK_TIMEOUT_SECONDS, dequeue_batch, fail_job, recover_stale_locks
 from models.job import Job
 
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
 
 def _make_job(**kwargs) -> Job:
     defaults = dict(
@@ -72,3 +78,124 @@ def test_job_completion():
     job.result = {"ok": True}
     assert job.status == "complete"
     assert job.result == {"ok": True}
+
+
+def test_process_voice_payload_roundtrip():
+    interaction_id, user_id = uuid.uuid4(), uuid.uuid4()
+    stored = ProcessVoicePayload(interaction_id=interaction_id, user_id=user_id).model_dump(mode="json")
+    assert stored["interaction_id"] == str(interaction_id)
+    assert stored["trace_id"]  # generated at enqueue
+
+    parsed = ProcessVoicePayload.model_validate(stored)
+    assert parsed.interaction_id == interaction_id
+    assert parsed.user_id == user_id
+    assert parsed.trace_id == stored["trace_id"]
+
+
+def test_process_voice_payload_ignores_unknown_keys():
+    parsed = ProcessVoicePayload.model_validate({
+        "interaction_id": str(uuid.uuid4()),
+        "user_id": str(uuid.uuid4()),
+        "legacy_flag": True,
+    })
+    assert parsed.dev_mode is False
+    assert parsed.conversation_id is None
+
+
+def _mock_db() -> MagicMock:
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock())
+    return db
+
+
+def _executed(db: MagicMock):
+    """The statement handed to db.execute, compiled for PostgreSQL."""
+    stmt = db.execute.await_args.args[0]
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return " ".join(str(compiled).split()), compiled.params
+
+
+@pytest.mark.asyncio
+async def test_fail_job_retries_with_backoff_or_fails_terminally():
+    db = _mock_db()
+    with patch("jobs.queue.utcnow", return_value=NOW):
+        await fail_job(db, uuid.uuid4(), "boom")
+
+    sql, params = _executed(db)
+    assert sql.startswith("UPDATE jobs SET status=CASE WHEN (jobs.attempts < jobs.max_attempts)")
+    assert "run_after=CASE WHEN (jobs.attempts < jobs.max_attempts) THEN" in sql
+    assert "power(%(power_1)s, jobs.attempts) * %(power_2)s ELSE jobs.run_after END" in sql
+    assert "RETURNING jobs.status, jobs.attempts, jobs.max_attempts, jobs.trace_id" in sql
+    assert "INSERT INTO events" not in sql
+    # retry branch first, terminal branch in the ELSE
+    assert (params["param_1"], params["param_2"]) == ("pending", "failed")
+    assert params["power_1"] == 2
+    assert params["power_2"] == timedelta(seconds=1)
+    assert NOW in params.values()
+    assert params["error"] == "boom"
+
+
+@pytest.mark.asyncio
+async def test_fail_job_records_event_in_same_statement():
+    db = _mock_db()
+    await fail_job(db, uuid.uuid4(), "boom", event_metadata={"job_type": "X"})
+
+    sql, params = _executed(db)
+    assert sql.startswith("WITH failed AS (UPDATE jobs SET status=CASE")
+    assert "failed_event AS (INSERT INTO events (id, event_type, level, source, metadata) SELECT" in sql
+    assert "FROM failed)" in sql
+    assert sql.endswith("FROM failed")
+    values = list(params.values())
+    for expected in ("job_failed", "error", "worker", {"job_type": "X"}):
+        assert expected in values
+
+
+@pytest.mark.asyncio
+async def test_dequeue_batch_claims_with_skip_locked():
+    db = _mock_db()
+    db.execute.return_value.scalars.return_value.all.return_value = []
+    with patch("jobs.queue.utcnow", return_value=NOW):
+        await dequeue_batch(db, "worker-abc", limit=4)
+
+    sql, params = _executed(db)
+    assert sql.startswith("UPDATE jobs SET status=%(status)s, attempts=(jobs.attempts + %(attempts_1)s)")
+    assert (
+        "WHERE jobs.id IN (SELECT jobs.id FROM jobs "
+        "WHERE jobs.status = %(status_1)s AND jobs.run_after <= %(run_after_1)s "
+        "ORDER BY jobs.run_after ASC LIMIT %(param_1)s FOR UPDATE SKIP LOCKED) RETURNING"
+    ) in sql
+    assert params["status"] == "processing"
+    assert params["status_1"] == "pending"
+    assert params["run_after_1"] == NOW
+    assert params["param_1"] == 4
+    assert params["locked_by"] == "worker-abc"
+
+
+@pytest.mark.asyncio
+async def test_recover_stale_locks_only_touches_expired_processing_jobs():
+    db = _mock_db()
+    db.execute.return_value.scalars.return_value.all.return_value = []
+    with patch("jobs.queue.utcnow", return_value=NOW):
+        await recover_stale_locks(db)
+
+    sql, params = _executed(db)
+    assert sql.startswith("UPDATE jobs SET")
+    assert "WHERE jobs.status = %(status_1)s AND jobs.locked_at < %(locked_at_1)s" in sql
+    assert params["status_1"] == "processing"
+    assert params["locked_at_1"] == NOW - timedelta(seconds=LOCK_TIMEOUT_SECONDS)
+    assert params["locked_by"] is None
+
+
+@pytest.mark.asyncio
+async def test_recover_stale_locks_fails_jobs_out_of_attempts():
+    db = _mock_db()
+    db.execute.return_value.scalars.return_value.all.return_value = ["pending", "failed", "pending"]
+    with patch("jobs.queue.utcnow", return_value=NOW):
+        requeued = await recover_stale_locks(db)
+
+    sql, params = _executed(db)
+    assert "status=CASE WHEN (jobs.attempts < jobs.max_attempts) THEN %(param_1)s ELSE %(param_2)s END" in sql
+    assert "run_after=CASE WHEN (jobs.attempts < jobs.max_attempts) THEN %(param_3)s ELSE jobs.run_after END" in sql
+    assert sql.endswith("RETURNING jobs.status")
+    assert (params["param_1"], params["param_2"], params["param_3"]) == ("pending", "failed", NOW)
+    assert requeued == 2
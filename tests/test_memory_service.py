@@ -5,15 +5,25 @@ Tests for memory extraction logic (mocking the LLM calls).
 from __future__ import annotations
 
 import json
-from unittest.mock import AsyncMock, patch
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
+from sqlalchemy.dialects import postgresql
 
-from services.memory_service import extract_memories
+import services.memory_service as memory_service
+from services.memory_service import (
+    _embed_query,
+    extract_memories,
+    retrieve_relevant_memories,
+    rule_based_memory_candidates,
+    store_memories,
+)
 
 
 @pytest.mark.asyncio
-async def test_extract_memories_returns_list():
+async def test_extract_memories_returns_list(extract_json_mock):
     mock_response = json.dumps({
         "memories": [
             {
@@ -24,27 +34,155 @@ async def test_extract_memories_returns_list():
             }
         ]
     })
-    with patch("services.memory_service.extract_json", new_callable=AsyncMock, return_value=mock_response):
-        result = await extract_memories(
-            transcript="I really love dinosaurs!",
-            assistant_reply="That's awesome! What's your favorite dinosaur?",
-            detected_emotion="happy",
-        )
+    extract_json_mock.return_value = mock_response
+    result = await extract_memories(
+        transcript="I really love dinosaurs!",
+        assistant_reply="That's awesome! What's your favorite dinosaur?",
+        detected_emotion="happy",
+    )
     assert len(result) == 1
     assert result[0]["content"] == "User likes dinosaurs"
     assert result[0]["category"] == "preference"
 
 
 @pytest.mark.asyncio
-async def test_extract_memories_empty_when_nothing_notable():
-    mock_response = json.dumps({"memories": []})
-    with patch("services.memory_service.extract_json", new_callable=AsyncMock, return_value=mock_response):
-        result = await extract_memories("hi", "hello!", "neutral")
+async def test_extract_memories_empty_when_nothing_notable(extract_json_mock):
+    extract_json_mock.return_value = json.dumps({"memories": []})
+    result = await extract_memories("hi", "hello!", "neutral")
     assert result == []
 
 
 @pytest.mark.asyncio
-async def test_extract_memories_handles_error():
-    with patch("services.memory_service.extract_json", new_callable=AsyncMock, side_effect=Exception("API Error")):
-        result = await extract_memories("test", "test", "neutral")
+async def test_extract_memories_handles_error(extract_json_mock):
+    extract_json_mock.side_effect = Exception("API Error")
+    result = await extract_memories("test", "test", "neutral")
     assert result == []
+
+
+def test_rule_based_candidates():
+    assert rule_based_memory_candidates("I like dinosaurs. My favorite color is blue!") == [
+        "Likes dinosaurs",
+        "Favorite color is blue",
+    ]
+    assert rule_based_memory_candidates("I like it") == []
+    assert rule_based_memory_candidates("Tell me a joke") == []
+
+
+@pytest.mark.asyncio
+async def test_extract_memories_rule_fast_path_skips_llm(extract_json_mock):
+    result = await extract_memories("I love space rockets", "Me too!", "happy")
+    extract_json_mock.assert_not_awaited()
+    assert result == [{
+        "content": "Loves space rockets",
+        "category": "preference",
+        "emotional_context": "happy",
+        "salience": 0.6,
+    }]
+
+
+@pytest.mark.asyncio
+async def test_store_memories_embeds_in_one_batch(sample_user_id):
+    db = MagicMock()
+    db.begin_nested.return_value.__aenter__ = AsyncMock()
+    db.begin_nested.return_value.__aexit__ = AsyncMock(return_value=False)
+    memories = [
+        {"content": "Likes dinosaurs", "category": "preference", "salience": 0.8},
+        {"content": "Has a dog named Rex", "category": "fact"},
+    ]
+    with (
+        patch("services.memory_service.generate_embeddings", new_callable=AsyncMock, return_value=[[0.1], [0.2]]) as batch,
+        patch("services.memory_service.bulk_store_memories", new_callable=AsyncMock) as bulk,
+    ):
+        await store_memories(db, sample_user_id, uuid.uuid4(), memories)
+
+    batch.assert_awaited_once_with(["Likes dinosaurs", "Has a dog named Rex"])
+    _, rows, vectors = bulk.await_args.args
+    assert [r["content"] for r in rows] == ["Likes dinosaurs", "Has a dog named Rex"]
+    assert rows[1]["category"] == "fact"
+    assert rows[1]["salience_score"] == 0.5
+    assert vectors == [[0.1], [0.2]]
+
+
+@pytest.mark.asyncio
+async def test_store_memories_falls_back_per_item_and_drops_unembedded(sample_user_id):
+    db = MagicMock()
+    db.begin_nested.return_value.__aenter__ = AsyncMock()
+    db.begin_nested.return_value.__aexit__ = AsyncMock(return_value=False)
+    memories = [{"content": "Likes dinosaurs"}, {"content": "Has a dog named Rex"}]
+
+    async def embed_one(content):
+        if content == "Has a dog named Rex":
+            raise RuntimeError("rate limited")
+        return [0.1]
+
+    with (
+        patch("services.memory_service.generate_embeddings", new_callable=AsyncMock, side_effect=RuntimeError("batch")),
+        patch("services.memory_service.generate_embedding", side_effect=embed_one),
+        patch("services.memory_service.bulk_store_memories", new_callable=AsyncMock) as bulk,
+    ):
+        await store_memories(db, sample_user_id, uuid.uuid4(), memories)
+
+    _, rows, vectors = bulk.await_args.args
+    assert [r["content"] for r in rows] == ["Likes dinosaurs"]
+    assert vectors == [[0.1]]
+
+
+@pytest.mark.asyncio
+async def test_query_embedding_is_cached():
+    with patch("services.memory_service.generate_embedding", new_callable=AsyncMock, return_value=[0.3]) as embed:
+        first = await _embed_query("favorite characters shows cartoons")
+        second = await _embed_query("favorite characters shows cartoons")
+    assert first == second == [0.3]
+    embed.assert_awaited_once()
+
+
+async def _run_retrieval(monkeypatch, pgvector_version: str) -> list[str]:
+    """Run retrieve_relevant_memories on a mock session; return the SQL it executed."""
+    monkeypatch.setattr(memory_service, "_iterative_scan_supported", None)
+    monkeypatch.setattr(
+        memory_service,
+        "_embed_query",
+        AsyncMock(return_value=np.full(memory_service.EMBEDDING_DIM, 0.5, dtype=np.float32)),
+    )
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = pgvector_version
+    result.scalars.return_value.all.return_value = []
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+
+    await retrieve_relevant_memories(db, uuid.uuid4(), "dinosaurs", limit=5)
+
+    return [
+        " ".join(str(call.args[0].compile(dialect=postgresql.dialect())).split())
+        for call in db.execute.await_args_list
+    ]
+
+
+@pytest.mark.asyncio
+async def test_retrieval_prefilters_bit_candidates_then_reranks(monkeypatch):
+    statements = await _run_retrieval(monkeypatch, "0.8.0")
+
+    assert "SET LOCAL hnsw.iterative_scan = relaxed_order" in statements
+    query = statements[-1]
+    bits = "CAST(binary_quantize({}) AS BIT(1536))"
+    candidates = (
+        "(SELECT memory_embeddings.memory_id AS memory_id, memory_embeddings.embedding AS embedding "
+        "FROM memory_embeddings JOIN memories ON memories.id = memory_embeddings.memory_id "
+        "WHERE memories.user_id = %(user_id_1)s::UUID "
+        f"ORDER BY {bits.format('memory_embeddings.embedding')} <~> "
+        f"{bits.format('CAST(%(query_embedding)s AS VECTOR(1536))')} "
+        "LIMIT %(param_1)s) AS anon_1"
+    )
+    assert candidates in query
+    assert query.endswith(
+        "ON anon_1.memory_id = memories.id "
+        "ORDER BY anon_1.embedding <=> CAST(%(query_embedding)s AS VECTOR(1536)) LIMIT %(param_2)s"
+    )
+
+
+@pytest.mark.asyncio
+async def test_retrieval_skips_iterative_scan_on_old_pgvector(monkeypatch):
+    statements = await _run_retrieval(monkeypatch, "0.7.4")
+
+    assert not any("iterative_scan" in sql for sql in statements)
+    assert statements[-1].startswith("SELECT memories.")
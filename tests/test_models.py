@@ -0,0 +1,48 @@
+"""Tests for ORM loading behaviour (in-memory SQLite, users table only)."""
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from models import Base, User
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[User.__table__])
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_loading_user_issues_single_query(engine):
+    async with AsyncSession(engine) as db:
+        db.add(User(name="Kid", email="kid@companion.local"))
+        await db.commit()
+
+        statements: list[str] = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        user = (await db.execute(select(User))).scalar_one()
+
+    assert user.name == "Kid"
+    assert len(statements) == 1  # no implicit relationship loads
+
+
+@pytest.mark.asyncio
+async def test_user_relationships_must_be_requested(engine):
+    async with AsyncSession(engine) as db:
+        db.add(User(name="Kid"))
+        await db.commit()
+        user = (await db.execute(select(User))).scalar_one()
+
+        with pytest.raises(InvalidRequestError):
+            _ = user.devices
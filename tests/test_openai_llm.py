@@ -0,0 +1,95 @@
+# tests/test_openai_llm.py
+"""Tests for the chat-completion reply cache (OpenAI client mocked)."""
+from __future__ import annotations
+
+import types
+from collections import OrderedDict
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import services.openai_llm as openai_llm
+from services.openai_llm import chat_completion
+
+PROMPT = "You are Sunny, a friendly companion."
+
+
+@pytest.fixture
+def llm(monkeypatch) -> AsyncMock:
+    """Fresh reply cache; returns the mocked completions.create."""
+    monkeypatch.setattr(openai_llm, "_reply_cache", OrderedDict())
+    monkeypatch.setattr(openai_llm, "get_settings", lambda: types.SimpleNamespace(openai_model="gpt-4o-mini"))
+
+    replies = iter(f"reply {n}" for n in range(100))
+
+    async def create(**kwargs):
+        message = types.SimpleNamespace(content=next(replies))
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=create)
+    monkeypatch.setattr(openai_llm, "get_openai_client", lambda: client)
+    return client.chat.completions.create
+
+
+@pytest.mark.asyncio
+async def test_greeting_reply_is_cached(llm):
+    first = await chat_completion(PROMPT, "Hello!", use_cache=True)
+    second = await chat_completion(PROMPT, "hello", use_cache=True)
+    assert first == second == "reply 0"
+    assert llm.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_other_messages_are_never_cached(llm):
+    first = await chat_completion(PROMPT, "tell me a joke", use_cache=True)
+    second = await chat_completion(PROMPT, "tell me a joke", use_cache=True)
+    assert first != second
+    assert llm.await_count == 2
+    assert not openai_llm._reply_cache
+
+
+@pytest.mark.asyncio
+async def test_cache_is_keyed_by_system_prompt(llm):
+    await chat_completion(PROMPT, "thank you", use_cache=True)
+    other = await chat_completion("You are Rex, a dinosaur.", "thank you", use_cache=True)
+    assert other == "reply 1"
+    assert llm.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_reply_expires(llm, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(openai_llm.time, "monotonic", lambda: clock[0])
+
+    await chat_completion(PROMPT, "hi", use_cache=True)
+    clock[0] += openai_llm.REPLY_CACHE_TTL_SECONDS + 1
+    again = await chat_completion(PROMPT, "hi", use_cache=True)
+
+    assert again == "reply 1"
+    assert llm.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_reply_is_evicted(llm, monkeypatch):
+    monkeypatch.setattr(openai_llm, "REPLY_CACHE_SIZE", 2)
+
+    await chat_completion(PROMPT, "hi", use_cache=True)         # reply 0
+    await chat_completion(PROMPT, "thanks", use_cache=True)     # reply 1
+    await chat_completion(PROMPT, "hi", use_cache=True)         # hit, "hi" now most recent
+    await chat_completion(PROMPT, "bye", use_cache=True)        # reply 2, evicts "thanks"
+
+    assert await chat_completion(PROMPT, "hi", use_cache=True) == "reply 0"
+    assert await chat_completion(PROMPT, "thanks", use_cache=True) == "reply 3"
+    assert len(openai_llm._reply_cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_story_turns_bypass_the_cache(llm):
+    # the voice handler passes use_cache=not telling_story
+    await chat_completion(PROMPT, "hi", use_cache=True)
+    story = await chat_completion(PROMPT, "hi", use_cache=False)
+
+    assert story == "reply 1"
+    assert llm.await_count == 2
+    assert len(openai_llm._reply_cache) == 1
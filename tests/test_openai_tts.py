@@ -0,0 +1,112 @@
+# tests/test_openai_tts.py
+"""Tests for streaming TTS to disk (fake OpenAI streaming response)."""
+from __future__ import annotations
+
+import asyncio
+import types
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.openai_tts import STREAM_READY_BYTES, partial_path, synthesize_speech
+
+CHUNK = b"\x01" * 4096
+
+
+class _FakeStreamingResponse:
+    def __init__(self, chunks: list[bytes], headers: dict[str, str], ready: asyncio.Event | None = None):
+        self.chunks = chunks
+        self.headers = headers
+        self.ready = ready
+        self.ready_after: list[int] = []  # bytes yielded before `ready` was seen set
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def iter_bytes(self, chunk_size: int):
+        sent = 0
+        for chunk in self.chunks:
+            if self.ready is not None and self.ready.is_set() and not self.ready_after:
+                self.ready_after.append(sent)
+            yield chunk
+            sent += len(chunk)
+
+
+@pytest.fixture
+def tts_response(monkeypatch):
+    """Install a fake streaming response for the next synthesize_speech call."""
+    monkeypatch.setattr(
+        "services.openai_tts.get_settings",
+        lambda: types.SimpleNamespace(openai_tts_model="tts-1", openai_tts_voice="nova"),
+    )
+
+    def install(response: _FakeStreamingResponse) -> _FakeStreamingResponse:
+        client = MagicMock()
+        client.audio.speech.with_streaming_response.create.return_value = response
+        monkeypatch.setattr("services.openai_tts.get_openai_client", lambda: client)
+        return response
+
+    return install
+
+
+@pytest.mark.asyncio
+async def test_ready_is_set_once_enough_audio_is_on_disk(tmp_path, tts_response):
+    ready = asyncio.Event()
+    chunks = [CHUNK] * 8
+    response = tts_response(_FakeStreamingResponse(chunks, {"content-length": str(len(CHUNK) * 8)}, ready=ready))
+    out = tmp_path / "reply.wav"
+
+    await synthesize_speech("hello", out, voice="nova", ready=ready)
+
+    # set after the chunk that crossed STREAM_READY_BYTES, before the stream ended
+    assert response.ready_after == [STREAM_READY_BYTES]
+    assert ready.is_set()
+
+
+@pytest.mark.asyncio
+async def test_part_file_is_renamed_on_completion(tmp_path, tts_response):
+    response = tts_response(_FakeStreamingResponse([CHUNK, b"tail"], {"content-length": str(len(CHUNK) + 4)}))
+    out = tmp_path / "reply.wav"
+
+    result = await synthesize_speech("hello", out)
+
+    assert result == out
+    assert out.read_bytes() == CHUNK + b"tail"
+    assert not partial_path(out).exists()
+
+
+@pytest.mark.asyncio
+async def test_short_reply_still_sets_ready(tmp_path, tts_response):
+    ready = asyncio.Event()
+    response = tts_response(_FakeStreamingResponse([b"tiny"], {}))
+    out = tmp_path / "reply.wav"
+
+    await synthesize_speech("hi", out, ready=ready)
+
+    assert ready.is_set()
+    assert out.read_bytes() == b"tiny"
+
+
+@pytest.mark.asyncio
+async def test_truncated_stream_raises_and_keeps_output_absent(tmp_path, tts_response):
+    response = tts_response(_FakeStreamingResponse([CHUNK], {"content-length": str(len(CHUNK) * 2)}))
+    out = tmp_path / "reply.wav"
+
+    with pytest.raises(IOError, match="truncated"):
+        await synthesize_speech("hello", out)
+
+    assert not out.exists()
+
+
+@pytest.mark.asyncio
+async def test_encoded_response_skips_length_check(tmp_path, tts_response):
+    # gzip Content-Length is smaller than the decoded audio
+    response = tts_response(_FakeStreamingResponse([CHUNK, CHUNK], {"content-length": "100", "content-encoding": "gzip"}))
+    out = tmp_path / "reply.wav"
+
+    await synthesize_speech("hello", out)
+
+    assert out.stat().st_size == len(CHUNK) * 2
@@ -61,3 +61,13 @@ def test_multiple_commands():
     assert result.is_command
     assert "humor" in result.trait_deltas
     assert result.set_mode == "creative"
+
+
+def test_first_listed_mode_wins():
+    result = parse_personality_command("Creative mode, no wait, switch to bedtime")
+    assert result.set_mode == "bedtime"
+
+
+def test_opposite_traits_cancel():
+    result = parse_personality_command("Be more verbose but be brief")
+    assert result.trait_deltas == {"verbosity": 0}
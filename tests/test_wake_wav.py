@@ -1,17 +1,16 @@
 import os
 import wave
-import struct
-import pvporcupine
+from concurrent.futures import ProcessPoolExecutor
 
-ACCESS_KEY = os.environ["PICOVOICE_ACCESS_KEY"]
+import numpy as np
+import pytest
 
-# built-in keyword for testing
-porcupine = pvporcupine.create(
-    access_key=ACCESS_KEY,
-    keywords=["porcupine"],
-)
+from tests.wake_word import create_porcupine
 
-def detect_in_wav(path: str) -> bool:
+# Porcupine frames decoded per read (~1 MB of 16-bit PCM at 512 samples/frame)
+FRAMES_PER_READ = 1024
+
+def detect_in_wav(porcupine, path: str) -> bool:
     with wave.open(path, "rb") as wf:
         if wf.getnchannels() != 1:
             raise ValueError(f"{path}: must be mono")
@@ -20,29 +19,62 @@ def detect_in_wav(path: str) -> bool:
         if wf.getframerate() != porcupine.sample_rate:
             raise ValueError(f"{path}: must be {porcupine.sample_rate} Hz")
 
+        frame_length = porcupine.frame_length
+        block_samples = frame_length * FRAMES_PER_READ
         while True:
-            pcm_bytes = wf.readframes(porcupine.frame_length)
-            if len(pcm_bytes) < porcupine.frame_length * 2:
+            samples = np.frombuffer(wf.readframes(block_samples), dtype=np.int16)
+            # a trailing partial frame is dropped, as before
+            for i in range(0, samples.size - frame_length + 1, frame_length):
+                if porcupine.process(samples[i:i + frame_length]) >= 0:
+                    return True
+            if samples.size < block_samples:
                 break
-            pcm = struct.unpack_from("h" * porcupine.frame_length, pcm_bytes)
-            if porcupine.process(pcm) >= 0:
-                return True
     return False
 
-def scan_folder(folder: str) -> None:
+def _check(porcupine, path: str) -> tuple[str, bool | str]:
+    """(path, detected) or (path, reason) when the file can't be scanned."""
+    try:
+        return path, detect_in_wav(porcupine, path)
+    except ValueError as e:
+        return path, str(e)
+
+
+def _check_batch(paths: list[str]) -> list[tuple[str, bool | str]]:
+    """Scan a batch in a pool process with an engine of its own (handles can't be pickled)."""
+    porcupine = create_porcupine()
+    try:
+        return [_check(porcupine, path) for path in paths]
+    finally:
+        porcupine.delete()
+
+
+def scan_folder(porcupine, folder: str, workers: int = 1) -> list[tuple[str, bool | str]]:
+    """
+    Scan every .wav in folder and return (path, detected-or-skip-reason) per
+    file. With workers > 1 files are split into one batch per pool process,
+    each batch loading (and deleting) its own engine.
+    """
     hits = 0
     total = 0
     skipped = 0
 
-    for name in os.listdir(folder):
-        if not name.lower().endswith(".wav"):
-            continue
+    with os.scandir(folder) as entries:
+        paths = [
+            entry.path
+            for entry in entries
+            if entry.is_file() and entry.name.lower().endswith(".wav")
+        ]
 
-        path = os.path.join(folder, name)
-        try:
-            ok = detect_in_wav(path)
-        except ValueError as e:
-            print(f"⚠️  SKIP {path}: {e}")
+    if workers > 1 and len(paths) > 1:
+        batches = [paths[i::workers] for i in range(min(workers, len(paths)))]
+        with ProcessPoolExecutor(max_workers=len(batches)) as pool:
+            results = [result for batch in pool.map(_check_batch, batches) for result in batch]
+    else:
+        results = [_check(porcupine, path) for path in paths]
+
+    for path, ok in results:
+        if isinstance(ok, str):
+            print(f"⚠️  SKIP {path}: {ok}")
             skipped += 1
             continue
 
@@ -51,6 +83,30 @@ def scan_folder(folder: str) -> None:
         hits += 1 if ok else 0
 
     print(f"\nHits: {hits}/{total} (skipped: {skipped})")
+    return results
+
+
+@pytest.mark.skipif("PICOVOICE_ACCESS_KEY" not in os.environ, reason="PICOVOICE_ACCESS_KEY not set")
+@pytest.mark.parametrize("folder", ["samples/wake", "samples/neg"])
+def test_scan_folder(porcupine, folder):
+    if not os.path.isdir(folder):
+        pytest.skip(f"{folder} not present")
+    results = scan_folder(porcupine, folder)
+    scanned = [(path, ok) for path, ok in results if not isinstance(ok, str)]
+    assert scanned, f"no scannable .wav files in {folder}"
+
+    if folder == "samples/wake":
+        missed = [path for path, ok in scanned if not ok]
+        assert not missed, f"wake word not detected in: {missed}"
+    else:
+        false_hits = [path for path, ok in scanned if ok]
+        assert not false_hits, f"wake word falsely detected in: {false_hits}"
+
+
 if __name__ == "__main__":
-    scan_folder("samples/wake")
-    scan_folder("samples/neg")
\ No newline at end of file
+    porcupine = create_porcupine()
+    try:
+        scan_folder(porcupine, "samples/wake", workers=os.cpu_count() or 1)
+        scan_folder(porcupine, "samples/neg", workers=os.cpu_count() or 1)
+    finally:
+        porcupine.delete()
@@ -0,0 +1,15 @@
+# tests/wake_word.py
+"""Porcupine engine factory shared by the wake-word fixture and scanner."""
+from __future__ import annotations
+
+import os
+
+
+def create_porcupine():
+    import pvporcupine
+
+    # built-in keyword for testing
+    return pvporcupine.create(
+        access_key=os.environ["PICOVOICE_ACCESS_KEY"],
+        keywords=["porcupine"],
+    )
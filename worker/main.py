@@ -1,6 +1,6 @@
 # worker/main.py
 """
-Background worker: polls the job queue and dispatches to handlers.
+Background worker: waits on job-queue notifications and dispatches to handlers.
 """
 from __future__ import annotations
 
@@ -9,17 +9,35 @@ import logging
 import os
 import platform
 import sys
-import traceback
 import uuid
 
 # Ensure project root is on path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import asyncpg
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+try:
+    import uvloop
+except ImportError:  # not available on Windows; fall back to the stdlib loop
+    uvloop = None
+
 from api.app.config import get_settings
+from db.engine import get_engine
 from db.session import get_db
-from jobs.queue import complete_job, dequeue, fail_job
+from jobs.queue import (
+    NOTIFY_CHANNEL,
+    STALE_RECOVERY_INTERVAL_SECONDS,
+    complete_job,
+    dequeue_batch,
+    fail_job,
+    next_pending_run_after,
+    recover_stale_locks,
+    utcnow,
+)
 from jobs.handlers import HANDLERS
-from services.observability import log_event
+from models.job import Job
 
 logging.basicConfig(
     level=logging.INFO,
@@ -30,77 +48,231 @@ logger = logging.getLogger("worker")
 
 WORKER_ID = f"worker-{platform.node()}-{uuid.uuid4().hex[:8]}"
 
+LISTEN_RETRY_SECONDS = 5
+# Lower bound on the idle wait, so a due-but-contended job can't make us spin
+MIN_IDLE_WAIT_SECONDS = 0.1
+
+
+async def _listen_for_jobs(wakeup: asyncio.Event, lost: asyncio.Event) -> asyncpg.Connection:
+    """
+    Open a dedicated asyncpg connection that sets `wakeup` on every job NOTIFY
+    and `lost` when the connection terminates.
+    """
+    url = make_url(get_settings().database_url).set(drivername="postgresql")
+    conn = await asyncpg.connect(url.render_as_string(hide_password=False))
+    try:
+        conn.add_termination_listener(lambda *_: lost.set())
+        await conn.add_listener(NOTIFY_CHANNEL, lambda *_: wakeup.set())
+    except BaseException:
+        # Don't leak a connection per failed reconnect attempt
+        await conn.close()
+        raise
+    return conn
+
+
+async def _keep_listening(wakeup: asyncio.Event, listening: asyncio.Event) -> None:
+    """Hold a LISTEN connection for the worker's lifetime, reconnecting when it drops."""
+    while True:
+        lost = asyncio.Event()
+        try:
+            conn = await _listen_for_jobs(wakeup, lost)
+        except Exception as exc:
+            logger.warning("LISTEN %s unavailable, polling instead: %s", NOTIFY_CHANNEL, exc)
+            await asyncio.sleep(LISTEN_RETRY_SECONDS)
+            continue
+
+        listening.set()
+        wakeup.set()  # notifications sent while we were disconnected are gone
+        try:
+            await lost.wait()
+            logger.warning("LISTEN %s connection lost, reconnecting", NOTIFY_CHANNEL)
+        finally:
+            listening.clear()
+            if not conn.is_closed():
+                await conn.close()
 
-async def run_loop() -> None:
-    settings = get_settings()
-    logger.info(
-        "Worker %s starting (poll=%.1fs)",
-        WORKER_ID,
-        settings.worker_poll_interval,
-    )
 
+async def _seconds_until_next_job(db: AsyncSession, cap: float) -> float:
+    """Idle wait: until the earliest scheduled pending job, at most `cap`."""
+    try:
+        next_at = await next_pending_run_after(db)
+        await db.commit()
+    except Exception as exc:
+        await db.rollback()
+        logger.warning("Could not read next run_after: %s", exc)
+        return cap
+
+    if next_at is None:
+        return cap
+    return max(MIN_IDLE_WAIT_SECONDS, min(cap, (next_at - utcnow()).total_seconds()))
+
+
+async def _recover_stale_locks_forever(wakeup: asyncio.Event) -> None:
+    """Put expired job locks back in the queue every few seconds."""
     while True:
+        await asyncio.sleep(STALE_RECOVERY_INTERVAL_SECONDS)
         try:
             async for db in get_db():
-                job = await dequeue(db, worker_id=WORKER_ID)
+                if await recover_stale_locks(db):
+                    wakeup.set()
+        except Exception as exc:
+            logger.exception("Stale lock recovery error: %s", exc)
 
-                if job is None:
-                    break  # no jobs, sleep and retry
 
-                job_id = str(job.id)
-                job_type = job.job_type
-                payload = job.payload
-                handler = HANDLERS.get(job.job_type)
+async def _claim_jobs(db: AsyncSession, limit: int) -> list[Job]:
+    """Claim up to `limit` jobs and commit the claim so other sessions can run them."""
+    try:
+        jobs = await dequeue_batch(db, worker_id=WORKER_ID, limit=limit)
+        await db.commit()
+    except Exception:
+        # Also lets the connection reconnect if it was invalidated
+        await db.rollback()
+        raise
+    # Jobs go to their own tasks/sessions; only already-loaded columns are read
+    db.expunge_all()
+    return jobs
 
-                if handler is None:
-                    await fail_job(
-                        db,
-                        job.id,
-                        f"Unknown job type: {job.job_type}",
-                    )
-                    await db.commit()
-                    continue
 
-                try:
-                    result = await handler(db, job.payload)
+async def _run_job(job: Job) -> None:
+    """Run one claimed job's handler in a session of its own."""
+    job_id = job.id
+    job_type = job.job_type
+    handler = HANDLERS.get(job_type)
 
-                    await complete_job(db, job.id, result)
+    try:
+        async for db in get_db():
+            if handler is None:
+                await fail_job(
+                    db,
+                    job_id,
+                    f"Unknown job type: {job_type}",
+                )
+                await db.commit()
+                continue
 
-                    await db.commit()  # ✅ SUCCESS COMMIT
+            try:
+                result = await handler(db, job.payload)
 
-                except Exception as exc:
-                    tb = traceback.format_exc()
+                await complete_job(db, job_id, result)
 
-                    # Revert any partial writes from the handler
-                    await db.rollback()
+                await db.commit()  # ✅ SUCCESS COMMIT
 
-                    # Mark job failed / schedule retry
-                    await fail_job(db, job, f"{exc}\n{tb}")
+            except Exception as exc:
+                # The stack is only formatted when DEBUG logging is on;
+                # the job row keeps a compact repr
+                logger.debug("Job %s [%s] failed", job_id, job_type, exc_info=True)
 
-                    # Log failure event (optional but good)
-                    await log_event(
-                        db,
-                        "job_failed",
-                        "error",
-                        source="worker",
-                        metadata={
-                            "job_id": str(job.id),
-                            "job_type": job.job_type,
-                            "error": str(exc),
-                        },
-                    )
+                # Revert any partial writes from the handler
+                await db.rollback()
 
-                    # Persist failure record + event
-                    await db.commit()
+                # Mark job failed / schedule retry and record the job_failed
+                # event in one statement
+                await fail_job(
+                    db,
+                    job_id,
+                    repr(exc),
+                    event_metadata={
+                        "job_id": str(job_id),
+                        "job_type": job_type,
+                        "error": str(exc),
+                    },
+                )
+
+                # Persist failure record + event
+                await db.commit()
+
+    except Exception as exc:
+        logger.exception("Worker error on job %s: %s", job_id, exc)
+
+
+async def run_loop() -> None:
+    # Read config once; the loop below only touches locals
+    settings = get_settings()
+    concurrency = settings.worker_concurrency
+
+    fallback_poll = settings.worker_fallback_poll_interval
+    poll = settings.worker_poll_interval
+
+    wakeup = asyncio.Event()
+    listening = asyncio.Event()
+    listener = asyncio.create_task(_keep_listening(wakeup, listening))
+
+    logger.info(
+        "Worker %s starting (fallback_poll=%.1fs, concurrency=%d)",
+        WORKER_ID,
+        fallback_poll,
+        concurrency,
+    )
+
+    recovery: asyncio.Task | None = None
+    claim_conn = None
+    claim_db: AsyncSession | None = None
+    in_flight: set[asyncio.Task] = set()
+
+    try:
+        # The claim loop keeps one connection for the worker's lifetime rather
+        # than checking one out of the pool on every poll
+        claim_conn = await get_engine().connect()
+        claim_db = AsyncSession(bind=claim_conn, expire_on_commit=False)
+
+        recovery = asyncio.create_task(_recover_stale_locks_forever(wakeup))
+
+        while True:
+            free = concurrency - len(in_flight)
+            if free <= 0:
+                # All slots busy: wait for one to finish before claiming more
+                await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                continue
+
+            # Clear before dequeue so a NOTIFY racing with an empty dequeue still wakes us.
+            wakeup.clear()
+
+            try:
+                jobs = await _claim_jobs(claim_db, free)
+            except Exception as exc:
+                jobs = []
+                logger.exception("Worker loop error: %s", exc)
+
+            for job in jobs:
+                task = asyncio.create_task(_run_job(job))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+
+            if jobs:
+                continue  # drain the backlog before waiting again
+
+            # Without LISTEN we poll; with it, the fallback poll is only a safety net.
+            # Either way wake up in time for the next scheduled retry.
+            cap = fallback_poll if listening.is_set() else poll
+            idle_timeout = await _seconds_until_next_job(claim_db, cap)
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=idle_timeout)
+            except asyncio.TimeoutError:
+                pass  # delayed retry due, or a missed notify
+    finally:
+        if recovery is not None:
+            recovery.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        listener.cancel()
+        if claim_db is not None:
+            await claim_db.close()
+        if claim_conn is not None:
+            await claim_conn.close()
 
-        except Exception as exc:
-            logger.exception("Worker loop error: %s", exc)
 
-        await asyncio.sleep(settings.worker_poll_interval)
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    # Python 3.12+: tasks that finish without suspending skip a loop round-trip
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        loop.set_task_factory(eager_task_factory)
+    return loop
 
 
 def main() -> None:
-    asyncio.run(run_loop())
+    with asyncio.Runner(loop_factory=_new_event_loop) as runner:
+        runner.run(run_loop())
 
 
 if __name__ == "__main__":